@@ -1,33 +1,65 @@
-import base64
+import hmac
 import os
 import streamlit as st
-import streamlit.components.v1 as components
+
+from ruota.component import COMPONENT_STATIC_URL, host, shed_idle_sessions, wheel
+from ruota.optimize import MANIFEST
+from ruota.registry import AssetRegistry
+from ruota.telemetry import figure as telemetry_figure
+from ruota.timing import profile
 
 # 1. SETUP E ASSETS
 st.set_page_config(page_title="Ruota Regali", page_icon="🎁", layout="wide")
 
 ASSETS = "assets"
 
-FILES = {
-    "bgm": os.path.join(ASSETS, "bgm.mp3"),
-    "spin": os.path.join(ASSETS, "spin.mp3"),
-    "gift": os.path.join(ASSETS, "gift.mp3"),
-    "malus": os.path.join(ASSETS, "malus.mp3"),
-    "gift_box": os.path.join(ASSETS, "gift_box.png"),
-    "malus1": os.path.join(ASSETS, "malus1.png"),
-    "malus2": os.path.join(ASSETS, "malus2.png"),
-    "malus3": os.path.join(ASSETS, "malus3.png"),
-    "malus4": os.path.join(ASSETS, "malus4.png"),
+# id -> file in assets/; il registro li deduplica per hash del contenuto.
+ASSET_FILES = {
+    "bgm": "bgm.mp3",
+    "spin": "spin.mp3",
+    "gift": "gift.mp3",
+    "malus": "malus.mp3",
+    "gift_box": "gift_box.png",
+    "malus1": "malus1.png",
+    "malus2": "malus2.png",
+    "malus3": "malus3.png",
+    "malus4": "malus4.png",
 }
 
-def b64(path: str) -> str:
+
+def asset_stamp() -> tuple:
+    """(mtime, dimensione) dei file e del manifest delle varianti: pochi stat per run."""
+    paths = [os.path.join(ASSETS, name) for name in ASSET_FILES.values()]
+    paths.append(os.path.join(ASSETS, "build", MANIFEST))
+    stamp = []
+    for path in paths:
+        try:
+            info = os.stat(path)
+            stamp.append((info.st_mtime_ns, info.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+@st.cache_resource(max_entries=1)
+def asset_table(stamp: tuple) -> dict:
+    """Tabella asset condivisa da tutte le ruote e le sessioni.
+
+    Ricostruita solo quando cambia ``stamp``: un file sostituito (hot reload) o
+    varianti nuove da ``python -m ruota.optimize`` arrivano senza riavviare.
+    """
+    registry = AssetRegistry(static_url=COMPONENT_STATIC_URL)
+    for asset_id, name in ASSET_FILES.items():
+        # URL con hash (o data URI in modalità inline), vedi RUOTA_ASSET_MODE.
+        registry.add(asset_id, os.path.join(ASSETS, name))
+    return registry.table()
+
+
+for name in ASSET_FILES.values():
+    path = os.path.join(ASSETS, name)
     if not os.path.exists(path):
         st.error(f"File mancante: {path}")
         st.stop()
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
-
-b64s = {k: b64(v) for k, v in FILES.items()}
 
 # 2. CSS PER STREAMLIT (KIOSK MODE)
 st.markdown(
@@ -42,513 +74,73 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# 3. JAVASCRIPT (STRINGA PURA - Nessun escaping necessario qui)
-JS_CODE = r"""
-(() => {
-  // --- CONFIG ---
-  const players = Array.from({length: 10}, (_, i) => `Player ${i+1}`);
-  const prizes = Array.from({length: 10}, (_, i) => String(i+1));
-
-  const malusDefs = [
-    { id: "MALUS_1", label: "IMPREVISTO", kind: "malus", img: "malus1" },
-    { id: "MALUS_2", label: "IMPREVISTO", kind: "malus", img: "malus2" },
-    { id: "MALUS_3", label: "IMPREVISTO", kind: "malus", img: "malus3" },
-    { id: "MALUS_4", label: "IMPREVISTO", kind: "malus", img: "malus4" },
-  ];
-
-  const malusPositions = new Set([0, 3, 7, 10]);
-  const segs = [];
-  let prizeIdx = 0;
-  let malusIdx = 0;
-
-  for (let i = 0; i < 14; i++) {
-    if (malusPositions.has(i)) {
-      segs.push(malusDefs[malusIdx++]);
-    } else {
-      const p = prizes[prizeIdx++];
-      segs.push({ id: `PRIZE_${p}`, label: p, kind: "prize" });
-    }
-  }
-
-  const bulbsCount = 32;
-  const spinSeconds = 6;
-
-  // --- DOM ---
-  const wheel = document.getElementById("wheel");
-  const face = document.getElementById("face");
-  const labels = document.getElementById("labels");
-  const rim = document.getElementById("rim");
-  const spinBtn = document.getElementById("spinBtn");
-  const turnLabel = document.getElementById("turnLabel");
-  const remainingEl = document.getElementById("remaining");
-  const burnedMalusEl = document.getElementById("burnedMalus");
-  const assignmentsEl = document.getElementById("assignments");
-
-  const overlayGift = document.getElementById("overlayGift");
-  const giftCard = document.getElementById("giftCard");
-  const giftNum = document.getElementById("giftNum");
-  const giftOk = document.getElementById("giftOk");
-
-  const overlayMalus = document.getElementById("overlayMalus");
-  const malusCard = document.getElementById("malusCard");
-  const malusImg = document.getElementById("malusImg");
-  const malusOk = document.getElementById("malusOk");
-  const packPickWrap = document.getElementById("packPickWrap");
-  const packPick = document.getElementById("packPick");
-
-  const bgm = document.getElementById("bgm");
-  const spinSfx = document.getElementById("spinSfx");
-  const giftSfx = document.getElementById("giftSfx");
-  const malusSfx = document.getElementById("malusSfx");
-
-  const malusImgMap = {
-    "malus1": "data:image/png;base64,__MALUS1_B64__",
-    "malus2": "data:image/png;base64,__MALUS2_B64__",
-    "malus3": "data:image/png;base64,__MALUS3_B64__",
-    "malus4": "data:image/png;base64,__MALUS4_B64__",
-  };
-
-  // --- STATO ---
-  let rotation = 0;
-  let playerIdxTurn = 0;
-  let lastPlayedPlayer = null;
-  const burnedPrizes = new Set();
-  const burnedMalus = new Set();
-  const assignments = {};
-  let overlayLock = false;
-  let activeMalusId = null;
-  const sliceDeg = 360 / segs.length;
-
-  // --- AUDIO ---
-  function stopAudio(a) { try { a.pause(); a.currentTime = 0; } catch (e) {} }
-
-  function fadeAudioTo(audio, target, ms) {
-    try {
-      const start = audio.volume;
-      const delta = target - start;
-      const steps = Math.max(1, Math.floor(ms / 16));
-      let i = 0;
-      const timer = setInterval(() => {
-        i++;
-        audio.volume = Math.max(0, Math.min(1, start + delta * (i / steps)));
-        if (i >= steps) clearInterval(timer);
-      }, 16);
-    } catch (e) {}
-  }
-
-  // --- LOGICA ---
-  function isBurned(id) {
-    if (id.startsWith("PRIZE_")) return burnedPrizes.has(id.split("_")[1]);
-    return burnedMalus.has(id);
-  }
-
-  function segColor(i, seg) {
-    if (isBurned(seg.id)) return "#7A7A7A";
-    if (seg.kind === "prize") return (i % 2 === 0) ? "#B51E1E" : "#F4E2C6";
-    return "#D8A83A";
-  }
-
-  function buildGradient() {
-    const stops = segs.map((seg, i) => {
-      const c = segColor(i, seg);
-      const a0 = i * sliceDeg;
-      const a1 = (i + 1) * sliceDeg;
-      return `${c} ${a0}deg ${a1}deg`;
-    });
-    return `conic-gradient(from -90deg, ${stops.join(", ")})`;
-  }
-
-  function renderLabels(activeIndex = null) {
-    labels.innerHTML = "";
-    const r = 210;
-    const baseRot = -90;
-    segs.forEach((seg, i) => {
-      const angleDeg = (i + 0.5) * sliceDeg + baseRot;
-      const div = document.createElement("div");
-      div.className = "seg-label";
-      if (isBurned(seg.id)) div.classList.add("burned");
-      if (activeIndex !== null && i === activeIndex) div.classList.add("active");
-      
-      div.textContent = (seg.kind === "malus") ? "IMPREVISTO" : `PREMIO ${seg.label}`;
-      div.style.transform = `translate(-50%, -50%) rotate(${angleDeg}deg) translateY(-${r}px) rotate(90deg)`;
-      labels.appendChild(div);
-    });
-  }
-
-  function renderBulbs() {
-    rim.innerHTML = "";
-    for (let i = 0; i < bulbsCount; i++) {
-      const b = document.createElement("div");
-      b.className = "bulb " + (i % 2 === 0 ? "a" : "b");
-      const ang = 360 * i / bulbsCount;
-      b.style.transform = `rotate(${ang}deg) translateY(calc(-1 * (min(410px, 47vw) - 15px)))`;
-      rim.appendChild(b);
-    }
-  }
-
-  function currentPlayer() { return players[playerIdxTurn]; }
-  function remainingPrizes() { return prizes.filter(x => !burnedPrizes.has(x)).length; }
-
-  function updateUI() {
-    turnLabel.textContent = `Turno: ${currentPlayer()}`;
-    remainingEl.textContent = String(remainingPrizes());
-    burnedMalusEl.textContent = String(burnedMalus.size);
-
-    const rows = players.map(pl => {
-      const val = assignments[pl] ? assignments[pl] : "";
-      const state = assignments[pl] ? "✅" : "⏳";
-      const isCurrent = (pl === currentPlayer()) && !assignments[pl];
-      const style = isCurrent ? "color: #FFD36B; font-weight:bold;" : "";
-      return `<div class="row" style="${style}"><div class="p">${pl}</div><div class="v">${state} ${val}</div></div>`;
-    });
-    assignmentsEl.innerHTML = rows.join("");
-    spinBtn.disabled = overlayLock || (remainingPrizes() === 0);
-  }
-
-  function burnSegment(seg) {
-    if (seg.kind === "prize") burnedPrizes.add(seg.label);
-    else burnedMalus.add(seg.id);
-  }
-
-  function computeRotationForIndex(index) {
-    const center = (index + 0.5) * sliceDeg;
-    const baseRot = -90;
-    return (360 + (0 - (baseRot + center))) % 360;
-  }
-
-  function pickStartIndex() { return Math.floor(Math.random() * segs.length); }
-
-  async function playSpinAudio() {
-    try { spinSfx.currentTime = 0; await spinSfx.play(); setTimeout(() => stopAudio(spinSfx), spinSeconds * 1000); } catch (e) {}
-  }
-  async function playGiftAudio() { try { giftSfx.currentTime=0; await giftSfx.play(); } catch(e){} }
-  async function playMalusAudio() { try { malusSfx.currentTime=0; await malusSfx.play(); } catch(e){} }
-
-  function advanceTurnFrom(lastPlayerName) {
-    const idx = players.indexOf(lastPlayerName);
-    const base = (idx >= 0) ? idx : playerIdxTurn;
-    playerIdxTurn = (base + 1) % players.length;
-  }
-
-  function movePlayerToEnd(playerName) {
-    const i = players.indexOf(playerName);
-    if (i < 0) return;
-    const p = players.splice(i, 1)[0];
-    players.push(p);
-  }
-
-  async function resolveBurnedByNudging(startIdx) {
-    let idx = startIdx;
-    let safety = 0;
-    while (isBurned(segs[idx].id)) {
-      renderLabels(idx);
-      idx = (idx + 1) % segs.length;
-      const nudge = computeRotationForIndex(idx);
-      rotation = (Math.trunc(rotation / 360) * 360) + nudge;
-      wheel.style.transition = "transform 280ms ease";
-      wheel.style.transform = `rotate(${rotation}deg)`;
-      await new Promise(r => setTimeout(r, 300));
-      safety++;
-      if (safety > segs.length + 2) break;
-    }
-    return idx;
-  }
-
-  async function spin() {
-    if (overlayLock) return;
-    const player = currentPlayer();
-    lastPlayedPlayer = player;
-
-    if (assignments[player]) {
-      advanceTurnFrom(player);
-      updateUI();
-      return;
-    }
-
-    spinBtn.disabled = true;
-    try { bgm.volume = (typeof bgm.volume === "number") ? bgm.volume : 0.7; fadeAudioTo(bgm, 0.0, 350); } catch (e) {}
-    playSpinAudio();
-
-    face.style.background = buildGradient();
-    renderLabels(null);
-
-    const startIdx = pickStartIndex();
-    const extraSpins = 8;
-    const currentMod = ((rotation % 360) + 360) % 360;
-    const targetMod = computeRotationForIndex(startIdx);
-    const delta = (360 + targetMod - currentMod) % 360;
-    rotation = rotation + extraSpins * 360 + delta;
-
-    wheel.style.transition = `transform ${spinSeconds}s cubic-bezier(0.10, 0.75, 0.10, 1)`;
-    wheel.style.transform = `rotate(${rotation}deg)`;
-
-    await new Promise(r => setTimeout(r, spinSeconds * 1000));
-
-    const finalIdx = await resolveBurnedByNudging(startIdx);
-    renderLabels(finalIdx);
-    const seg = segs[finalIdx];
-
-    if (isBurned(seg.id)) {
-      fadeAudioTo(bgm, 0.7, 450);
-      updateUI();
-      return;
-    }
-
-    burnSegment(seg);
-    face.style.background = buildGradient();
-    renderLabels(finalIdx);
-
-    if (seg.kind === "prize") {
-      assignments[player] = seg.label;
-      await playGiftAudio();
-      showGiftOverlay(seg.label);
-      return;
-    }
-
-    await playMalusAudio();
-    showMalusOverlay(seg);
-
-    // --- MALUS 1: Scambio + Salto ---
-    if (seg.id === "MALUS_1") {
-      const currIdx = playerIdxTurn;
-      const nextIdx = (playerIdxTurn + 1) % players.length;
-      const temp = players[currIdx];
-      players[currIdx] = players[nextIdx];
-      players[nextIdx] = temp;
-      updateUI();
-      const prevIdx = (currIdx - 1 + players.length) % players.length;
-      lastPlayedPlayer = players[prevIdx];
-    }
-
-    if (seg.id === "MALUS_3") {
-      movePlayerToEnd(player);
-      playerIdxTurn = players.indexOf(player);
-    }
-  }
-
-  function showGiftOverlay(prizeLabel) {
-    overlayLock = true;
-    spinBtn.disabled = true;
-    giftNum.textContent = prizeLabel;
-    overlayGift.classList.add("show");
-    giftCard.classList.remove("pop");
-    void giftCard.offsetWidth;
-    giftCard.classList.add("pop");
-    giftOk.disabled = true;
-    setTimeout(() => { giftOk.disabled = false; }, 12000);
-  }
-
-  function hideGiftOverlay() {
-    overlayGift.classList.remove("show");
-    giftCard.classList.remove("pop");
-    overlayLock = false;
-    updateUI();
-  }
-
-  function showMalusOverlay(malusSeg) {
-    overlayLock = true;
-    spinBtn.disabled = true;
-    activeMalusId = malusSeg.id;
-    malusImg.src = malusImgMap[malusSeg.img];
-    overlayMalus.classList.add("show");
-    malusCard.classList.remove("pop");
-    void malusCard.offsetWidth;
-    malusCard.classList.add("pop");
-    packPickWrap.style.display = "none";
-    packPick.value = "";
-    malusOk.disabled = true;
-    setTimeout(() => {
-      if (malusSeg.id === "MALUS_2") {
-        packPickWrap.style.display = "grid";
-        packPick.focus();
-      }
-      malusOk.disabled = false;
-    }, 12000);
-  }
-
-  function hideMalusOverlay() {
-    overlayMalus.classList.remove("show");
-    malusCard.classList.remove("pop");
-    packPickWrap.style.display = "none";
-    overlayLock = false;
-    updateUI();
-  }
-
-  giftOk.addEventListener("click", () => {
-    stopAudio(giftSfx);
-    const justPlayed = lastPlayedPlayer;
-    hideGiftOverlay();
-    advanceTurnFrom(justPlayed);
-    try { fadeAudioTo(bgm, 0.7, 450); bgm.play().catch(() => {}); } catch (e) {}
-    updateUI();
-  });
-
-  malusOk.addEventListener("click", () => {
-    stopAudio(malusSfx);
-    const justPlayed = lastPlayedPlayer;
-    if (activeMalusId === "MALUS_2") {
-      const raw = (packPick.value || "").trim();
-      const n = parseInt(raw, 10);
-      if (!Number.isFinite(n) || n < 1 || n > 10) { alert("Inserisci un numero pacco valido (1-10)."); return; }
-      const pack = String(n);
-      if (burnedPrizes.has(pack)) { alert("Pacco già assegnato."); return; }
-      assignments[justPlayed] = pack;
-      burnedPrizes.add(pack);
-      face.style.background = buildGradient();
-      renderLabels(null);
-    }
-    hideMalusOverlay();
-    if (activeMalusId === "MALUS_4") {
-      try { fadeAudioTo(bgm, 0.7, 450); bgm.play().catch(() => {}); } catch (e) {}
-      updateUI();
-      return;
-    }
-    advanceTurnFrom(justPlayed);
-    try { fadeAudioTo(bgm, 0.7, 450); bgm.play().catch(() => {}); } catch (e) {}
-    updateUI();
-  });
-
-  function init() {
-    renderBulbs();
-    face.style.background = buildGradient();
-    renderLabels(null);
-    updateUI();
-    spinBtn.addEventListener("click", () => {
-      try { bgm.volume = 0.7; bgm.play().catch(() => {}); } catch (e) {}
-      spin();
-    });
-  }
-
-  init();
-})();
-"""
-
-# INIEZIONE VARIABILI NEL JS (Senza rompere la sintassi)
-JS_CODE = JS_CODE.replace("__MALUS1_B64__", b64s["malus1"]) \
-                 .replace("__MALUS2_B64__", b64s["malus2"]) \
-                 .replace("__MALUS3_B64__", b64s["malus3"]) \
-                 .replace("__MALUS4_B64__", b64s["malus4"])
-
-# 4. HTML STRUTTURA (CON F-STRING PER CSS E IMMAGINI)
-html_struct = f"""
-<div id="app">
-  <div class="topbar">
-    <div class="title">🎁 Ruota Regali</div>
-    <div class="turn" id="turnLabel">Turno: Player 1</div>
-  </div>
-  <div class="stage">
-    <div class="wheel-wrap">
-      <div class="pointer" title="pointer"></div>
-      <div class="rim" id="rim"></div>
-      <div class="wheel" id="wheel">
-        <div class="face" id="face"></div>
-        <div class="labels" id="labels"></div>
-        <div class="hub"></div>
-      </div>
-    </div>
-    <div class="controls">
-      <button id="spinBtn" class="spin">SPIN</button>
-      <div class="meta">
-        <div class="pill">Premi rimasti: <span id="remaining">10</span></div>
-        <div class="pill">Imprevisti bruciati: <span id="burnedMalus">0</span></div>
-      </div>
-      <div class="assignments" id="assignments"></div>
-    </div>
-  </div>
-
-  <div class="overlay" id="overlayGift" aria-hidden="true">
-    <div class="card fullscreen" id="giftCard">
-      <div class="imgwrap fullscreen">
-        <img class="img fullscreen" id="giftImg" src="data:image/png;base64,{b64s["gift_box"]}" alt="gift"/>
-        <div class="num big" id="giftNum">1</div>
-      </div>
-      <button class="ok center big" id="giftOk" disabled>OK</button>
-    </div>
-  </div>
-
-  <div class="overlay" id="overlayMalus" aria-hidden="true">
-    <div class="card" id="malusCard">
-      <div class="imgwrap">
-        <img class="img" id="malusImg" src="data:image/png;base64,{b64s["malus1"]}" alt="malus"/>
-      </div>
-      <div class="row-actions">
-        <div class="left-pack" id="packPickWrap" style="display:none;">
-          <div class="packLabel">Numero pacco</div>
-          <input id="packPick" class="packInput" inputmode="numeric" placeholder="#" />
-        </div>
-        <button class="ok big" id="malusOk" disabled>OK</button>
-      </div>
-    </div>
-  </div>
-
-  <audio id="bgm" autoplay loop preload="auto" playsinline><source src="data:audio/mpeg;base64,{b64s["bgm"]}" type="audio/mpeg" /></audio>
-  <audio id="spinSfx" preload="auto" playsinline><source src="data:audio/mpeg;base64,{b64s["spin"]}" type="audio/mpeg" /></audio>
-  <audio id="giftSfx" preload="auto" playsinline><source src="data:audio/mpeg;base64,{b64s["gift"]}" type="audio/mpeg" /></audio>
-  <audio id="malusSfx" preload="auto" playsinline><source src="data:audio/mpeg;base64,{b64s["malus"]}" type="audio/mpeg" /></audio>
-</div>
-
-<style>
-  :root {{
-    --bg: #0B1220;
-    --panel: rgba(17, 26, 46, 0.78);
-    --gold: #E2B24A;
-    --text: #E5E7EB;
-  }}
-  html, body {{ margin: 0; padding: 0; width: 100%; height: 100vh; overflow: hidden; background: var(--bg); }}
-  #app {{ width: 100%; height: 100%; box-sizing: border-box; display: flex; flex-direction: column; padding: 10px; color: var(--text); font-family: system-ui, sans-serif; }}
-  
-  .topbar {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; padding: 10px 14px; background: var(--panel); border: 1px solid rgba(255,255,255,0.08); border-radius: 16px; }}
-  .title {{ font-weight: 950; font-size: 18px; }}
-  .turn {{ font-weight: 900; opacity: 0.95; }}
-  
-  .stage {{ display: grid; grid-template-columns: 1.25fr 0.75fr; gap: 18px; align-items: start; height: 100%; }}
-  .wheel-wrap {{ position: relative; width: min(80vh, 80vw); max-width: 800px; aspect-ratio: 1/1; margin: 0 auto; }}
-
-  /* WHEEL ASSETS */
-  .pointer {{ position: absolute; top: -0.5%; left: 50%; transform: translateX(-50%); width: 72px; height: 72px; z-index: 60; filter: drop-shadow(0 10px 10px rgba(0,0,0,0.35)); }}
-  .pointer::before {{ content: ""; position: absolute; inset: 0; border-radius: 999px; background: radial-gradient(circle at 30% 30%, #FFE9A6 0%, #E2B24A 35%, #A47A1F 70%, #5A3A08 100%); box-shadow: inset 0 0 0 6px rgba(255,255,255,0.12); }}
-  .pointer::after {{ content: ""; position: absolute; left: 50%; bottom: -22px; transform: translateX(-50%); border-left: 18px solid transparent; border-right: 18px solid transparent; border-top: 30px solid var(--gold); }}
-  .hub {{ position: absolute; inset: 40%; border-radius: 50%; background: radial-gradient(circle at 30% 30%, #FFE9A6 0%, #D8A83A 35%, #A47A1F 70%, #5A3A08 100%); box-shadow: inset 0 0 0 8px rgba(255,255,255,0.12), 0 10px 22px rgba(0,0,0,0.35); }}
-  .face {{ position: absolute; inset: 0; border-radius: 50%; box-shadow: inset 0 0 0 10px rgba(226,178,74,0.92), inset 0 0 0 16px rgba(124,20,48,0.92), 0 24px 44px rgba(0,0,0,0.48); }}
-  .rim {{ position: absolute; inset: 0; border-radius: 50%; z-index: 8; pointer-events: none; }}
-  .bulb {{ position: absolute; top: 50%; left: 50%; width: 13px; height: 13px; margin: -6.5px; border-radius: 50%; transform-origin: 0 0; animation: blink 1.05s infinite; }}
-  .bulb.a {{ background: #FFD36B; box-shadow: 0 0 12px rgba(255, 210, 110, 0.98); }}
-  .bulb.b {{ background: #FF6B6B; box-shadow: 0 0 12px rgba(255, 105, 105, 0.92); animation-delay: 0.22s; }}
-  @keyframes blink {{ 0%, 100% {{ opacity: 0.35; filter: saturate(0.9); }} 50% {{ opacity: 1; filter: saturate(1.25); }} }}
-  .wheel {{ position: absolute; inset: 6%; border-radius: 50%; transform: rotate(0deg); z-index: 10; }}
-  .labels {{ position: absolute; inset: 0; border-radius: 50%; pointer-events: none; }}
-  .seg-label {{ position: absolute; top: 50%; left: 50%; text-align: center; font-weight: 1000; color: rgba(255,255,255,0.92); font-size: clamp(12px, 1.6vw, 22px); text-shadow: 0 3px 4px rgba(0,0,0,0.35); white-space: nowrap; }}
-  .seg-label.burned {{ color: rgba(255,255,255,0.55); text-shadow: none; }}
-
-  /* UI */
-  .controls {{ background: var(--panel); border: 1px solid rgba(255,255,255,0.08); border-radius: 16px; padding: 14px; }}
-  .spin {{ width: 100%; font-size: 22px; font-weight: 1000; padding: 14px; border-radius: 16px; border: 0; cursor: pointer; background: linear-gradient(180deg, #F3C35A, #C58B19); color: #23180A; }}
-  .spin:disabled {{ opacity: 0.5; cursor: not-allowed; }}
-  .meta {{ display: flex; gap: 10px; margin-top: 12px; }}
-  .pill {{ background: rgba(255,255,255,0.06); padding: 10px; border-radius: 14px; font-weight: 900; }}
-  .assignments {{ margin-top: 12px; font-size: 14px; }}
-  .assignments .row {{ display: flex; justify-content: space-between; padding: 7px 0; border-bottom: 1px solid rgba(255,255,255,0.06); }}
-  .p {{ font-weight: 900; }}
-  .v {{ opacity: 0.9; }}
-
-  /* OVERLAYS (Fix Dimensioni) */
-  .overlay {{ position: fixed; inset: 0; display: grid; place-items: center; background: rgba(0,0,0,0.5); opacity: 0; pointer-events: none; z-index: 9999; transition: opacity 0.2s; overflow: hidden !important; }}
-  .overlay.show {{ opacity: 1; pointer-events: auto; }}
-  .card {{ background: rgba(17, 26, 46, 0.95); border: 1px solid rgba(255,255,255,0.1); border-radius: 18px; padding: 20px; width: min(380px, 45vw); box-shadow: 0 34px 90px rgba(0,0,0,0.6); transform: scale(0.85); opacity: 0; display: flex; flex-direction: column; align-items: center; justify-content: center; }}
-  .card.pop {{ animation: popIn 0.5s cubic-bezier(0.16, 0.85, 0.18, 1) forwards; }}
-  @keyframes popIn {{ 0% {{ transform: scale(0.7); opacity: 0; }} 100% {{ transform: scale(1); opacity: 1; }} }}
-  .card.fullscreen {{ width: min(500px, 50vw) !important; height: auto !important; padding: 30px !important; }}
-  .imgwrap {{ width: 100%; display: flex; justify-content: center; margin-bottom: 15px; position: relative; }}
-  .img {{ max-height: 40vh; object-fit: contain; width: 100%; }}
-  .num {{ position: absolute; inset: 0; display: grid; place-items: center; font-weight: 1000; font-size: clamp(40px, 6vw, 80px); color: #FFE9A6; -webkit-text-stroke: 2px rgba(0,0,0,0.25); pointer-events: none; }}
-  .num.big {{ font-size: clamp(80px, 10vw, 140px); }}
-  .ok {{ background: linear-gradient(180deg, #F3C35A, #C58B19); color: #23180A; border: 0; border-radius: 14px; padding: 12px 20px; font-weight: 1000; font-size: 16px; cursor: pointer; min-width: 130px; }}
-  .row-actions {{ display: flex; gap: 14px; align-items: center; }}
-  .packInput {{ border-radius: 12px; border: 1px solid rgba(255,255,255,0.16); background: rgba(0,0,0,0.22); color: #FFF; padding: 12px; font-size: 16px; outline: none; }}
-</style>
-"""
-
-# Assemblaggio finale: HTML Head + Script JS (separato) + Chiusura
-full_html = html_struct + "\n<script>\n" + JS_CODE + "\n</script>"
-
-components.html(full_html, height=900, scrolling=False)
+# 3. RUOTA (componente dichiarato: HTML/JS/CSS in frontend/, regole in ruota/engine.py)
+# Una o più ruote con nome (RUOTA_WHEELS), scelte con ?wheel=<nome>; ?ops=<RUOTA_OPS_TOKEN>
+# mostra sessioni, memoria e payload del processo e la telemetria del frontend (senza
+# token configurato la pagina operatore è spenta: può chiudere sessioni e azzerare partite).
+try:
+    HOST = host()
+    profile()  # RUOTA_TIMING, prima di montare la ruota
+except ValueError as exc:  # ruote (ruota/config.py) o profilo di tempo (ruota/timing.py) non validi
+    st.error(str(exc))
+    st.stop()
+missing = {seg["img"] for w in HOST.wheels.values() for seg in w.payload["segs"] if "img" in seg} - set(ASSET_FILES)
+if missing:
+    st.error(f"Immagini dei malus senza asset: {', '.join(sorted(missing))}")
+    st.stop()
+
+OPS_TOKEN = os.environ.get("RUOTA_OPS_TOKEN", "")
+
+
+def is_operator() -> bool:
+    given = st.query_params.get("ops", "")
+    return bool(OPS_TOKEN) and hmac.compare_digest(given.encode(), OPS_TOKEN.encode())
+
+
+if is_operator():
+    stats = HOST.stats()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Memoria processo", f"{stats['rss_bytes'] / 2**20:.1f} MB")
+    c2.metric("Sessioni", stats["sessions"])
+    c3.metric("Memoria sessioni (stima)", f"{stats['session_bytes'] / 1024:.1f} KB")
+    st.dataframe(stats["wheels"])
+    st.dataframe(stats["per_session"])
+    if st.button("Chiudi sessioni inattive"):
+        st.write(f"Chiuse: {len(shed_idle_sessions(HOST, close_idle=True))}")
+    # Il giornale riprende sempre l'ultima partita, anche finita: qui se ne comincia una nuova.
+    cols = st.columns(len(HOST.wheels))
+    for col, (name, w) in zip(cols, HOST.wheels.items()):
+        if col.button(f"Nuova partita: {name}", key=f"new_game:{name}"):
+            w.new_game()
+            col.success(f"{name}: nuova partita")
+
+    # Telemetria del frontend (RUOTA_TELEMETRY), aggiornata da sola ogni pochi secondi.
+    fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+    @fragment(run_every=5)
+    def telemetry_panel():
+        telemetry = HOST.telemetry
+        st.subheader("Prestazioni del frontend")
+        metrics = telemetry.metrics()
+        if not metrics:
+            st.caption("Nessun campione: avvia con RUOTA_TELEMETRY=<secondi> per raccoglierli.")
+            return
+        c1, c2 = st.columns(2)
+        metric = c1.selectbox("Metrica", metrics, index=metrics.index("spin") if "spin" in metrics else 0)
+        by = c2.radio("Per", ["device", "session"], horizontal=True,
+                      format_func=lambda v: "dispositivo" if v == "device" else "sessione")
+        st.plotly_chart(telemetry_figure(telemetry, metric, by))
+        st.dataframe([row for row in telemetry.table(by) if row["metric"] == metric])
+        st.dataframe(telemetry.device_rows())
+        if telemetry.lost:
+            st.caption(f"Campioni persi nei ring buffer dei browser: {telemetry.lost}")
+
+    telemetry_panel()
+    st.stop()
+
+try:
+    target = HOST.wheel(st.query_params.get("wheel"))
+except ValueError as exc:
+    st.error(str(exc))
+    st.stop()
+wheel(asset_table(asset_stamp()), target)
@@ -0,0 +1 @@
+# Radice del repository: pytest la mette in sys.path, i test importano "ruota" senza installazione.
@@ -0,0 +1,116 @@
+// Motore Web Audio: ogni suono è decodificato una volta in un AudioBuffer, gli SFX
+// partono come BufferSource usa-e-getta e fade, ducking e stop sono rampe di
+// GainNode schedulate sul clock audio (niente setInterval sul main thread).
+// Ducking: finché suona almeno uno SFX la musica scende a DUCK_LEVEL su un gain
+// a parte, così i fade della BGM (bgmGain) e il ducking non si pestano i piedi.
+const DUCK_LEVEL = 0.35;
+const DUCK_MS = 80;
+const UNDUCK_MS = 400;
+
+function createWebAudio(resolveUrl) {
+  const Ctx = window.AudioContext || window.webkitAudioContext;
+  if (!Ctx) return null;
+
+  const ctx = new Ctx();
+  const master = ctx.createGain();
+  master.connect(ctx.destination);
+  const bgmGain = ctx.createGain();
+  const duckGain = ctx.createGain();
+  bgmGain.connect(duckGain);
+  duckGain.connect(master);
+  const sfxGain = ctx.createGain();
+  sfxGain.connect(master);
+
+  const buffers = {};
+  const playing = {};
+  let bgmStart = null;
+  let voices = 0;  // SFX in corso: la musica torna su quando finisce l'ultimo
+
+  function load(id) {
+    if (!buffers[id]) {
+      buffers[id] = fetch(resolveUrl(id))
+        .then(r => r.arrayBuffer())
+        .then(data => ctx.decodeAudioData(data));
+      buffers[id].catch(() => { delete buffers[id]; });
+    }
+    return buffers[id];
+  }
+
+  function ramp(param, target, ms, at = ctx.currentTime) {
+    param.cancelScheduledValues(at);
+    param.setValueAtTime(param.value, at);
+    param.linearRampToValueAtTime(target, at + Math.max(ms, 1) / 1000);
+  }
+
+  function duck() {
+    if (voices++ === 0) ramp(duckGain.gain, DUCK_LEVEL, DUCK_MS);
+  }
+
+  function unduck() {
+    if (--voices === 0) ramp(duckGain.gain, 1, UNDUCK_MS);
+  }
+
+  function resume() {
+    if (ctx.state === "suspended") ctx.resume().catch(() => {});
+  }
+
+  // Ritorna l'istante (clock audio) in cui il suono parte davvero.
+  async function play(id, stopAfterMs = 0) {
+    resume();
+    const buffer = await load(id);
+    const src = ctx.createBufferSource();
+    src.buffer = buffer;
+    const gain = ctx.createGain();
+    src.connect(gain);
+    gain.connect(sfxGain);
+    const t = ctx.currentTime;
+    src.start(t);
+    if (stopAfterMs) {
+      const end = t + stopAfterMs / 1000;
+      gain.gain.setValueAtTime(1, Math.max(t, end - 0.05));
+      gain.gain.linearRampToValueAtTime(0, end);
+      src.stop(end);
+    }
+    const voice = { src, gain };
+    (playing[id] = playing[id] || []).push(voice);
+    duck();
+    src.onended = () => {
+      playing[id] = playing[id].filter(v => v !== voice);
+      unduck();
+    };
+    return t;
+  }
+
+  function stop(id, ms = 40) {
+    const t = ctx.currentTime;
+    (playing[id] || []).forEach(({ src, gain }) => {
+      ramp(gain.gain, 0, ms, t);
+      try { src.stop(t + ms / 1000); } catch (e) {}
+    });
+  }
+
+  function startBgm(level) {
+    resume();
+    if (!bgmStart) {
+      bgmGain.gain.value = 0;
+      bgmStart = load("bgm").then(buffer => {
+        const src = ctx.createBufferSource();
+        src.buffer = buffer;
+        src.loop = true;
+        src.connect(bgmGain);
+        src.start();
+      });
+      bgmStart.catch(() => { bgmStart = null; });
+    }
+    ramp(bgmGain.gain, level, 450);
+  }
+
+  return {
+    load,
+    play,
+    stop,
+    startBgm,
+    fadeBgm(target, ms) { ramp(bgmGain.gain, target, ms); },
+    get time() { return ctx.currentTime; },
+  };
+}
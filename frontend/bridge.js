@@ -0,0 +1,21 @@
+// Protocollo dei componenti Streamlit (v1), scritto a mano: nessun build npm.
+const Bridge = (() => {
+  const listeners = [];
+
+  function send(type, data) {
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type }, data), "*");
+  }
+
+  window.addEventListener("message", (ev) => {
+    const msg = ev.data;
+    if (!msg || msg.type !== "streamlit:render") return;
+    listeners.forEach(fn => fn(msg.args || {}));
+  });
+
+  return {
+    onRender(fn) { listeners.push(fn); },
+    ready() { send("streamlit:componentReady", { apiVersion: 1 }); },
+    setFrameHeight(height) { send("streamlit:setFrameHeight", { height }); },
+    setValue(value) { send("streamlit:setComponentValue", { value, dataType: "json" }); },
+  };
+})();
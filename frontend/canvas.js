@@ -0,0 +1,160 @@
+// Renderer canvas della ruota: faccia ed etichette disegnate una volta su un canvas
+// offscreen (ridisegnato solo quando brucia un segmento); la rotazione è un solo
+// drawImage per frame in un loop requestAnimationFrame con la stessa easing del CSS.
+
+// Risolve una cubic-bezier CSS (x1, y1, x2, y2) come funzione t -> progresso.
+function cubicBezier(x1, y1, x2, y2) {
+  const cx = 3 * x1, bx = 3 * (x2 - x1) - cx, ax = 1 - cx - bx;
+  const cy = 3 * y1, by = 3 * (y2 - y1) - cy, ay = 1 - cy - by;
+  const sampleX = t => ((ax * t + bx) * t + cx) * t;
+  const sampleY = t => ((ay * t + by) * t + cy) * t;
+  const slopeX = t => (3 * ax * t + 2 * bx) * t + cx;
+  return (x) => {
+    if (x <= 0) return 0;
+    if (x >= 1) return 1;
+    let t = x;
+    for (let i = 0; i < 8; i++) {
+      const err = sampleX(t) - x;
+      const d = slopeX(t);
+      if (Math.abs(err) < 1e-6 || Math.abs(d) < 1e-6) break;
+      t -= err / d;
+    }
+    // Newton può uscire da [0, 1] con curve molto ripide: bisezione di riserva.
+    if (t < 0 || t > 1 || Math.abs(sampleX(t) - x) > 1e-4) {
+      let lo = 0, hi = 1;
+      t = x;
+      for (let i = 0; i < 30; i++) {
+        if (sampleX(t) < x) lo = t; else hi = t;
+        t = (lo + hi) / 2;
+      }
+    }
+    return sampleY(t);
+  };
+}
+
+function createCanvasRenderer(canvas, opts) {
+  const ctx = canvas.getContext("2d");
+  const face = document.createElement("canvas");
+  const fctx = face.getContext("2d");
+  let size = 0;
+  let dpr = 1;
+  let rotation = 0;
+  let anim = null;
+  let active = null;  // fetta evidenziata (segmento sotto il puntatore), disegnata a ogni frame
+
+  function labelFont() {
+    // Come .seg-label: clamp(min px, vw, max px) della configurazione, peso 1000.
+    const [min, vw, max] = opts.labelFont;
+    const px = Math.max(min, Math.min(max, window.innerWidth * vw / 100));
+    return `1000 ${px * dpr}px system-ui, sans-serif`;
+  }
+
+  // Ogni fetta copre i segmenti [from, to): uno solo, o un gruppo quando sono tanti.
+  function paintFace() {
+    const slices = opts.slices();
+    const unit = (2 * Math.PI) / opts.total();
+    const c = size / 2;
+    fctx.clearRect(0, 0, size, size);
+    slices.forEach((s, k) => {
+      // conic-gradient(from -90deg): il segmento 0 parte da ore 9.
+      fctx.beginPath();
+      fctx.moveTo(c, c);
+      fctx.arc(c, c, c, s.from * unit - Math.PI, s.to * unit - Math.PI);
+      fctx.closePath();
+      fctx.fillStyle = opts.color(k);
+      fctx.fill();
+    });
+
+    fctx.font = labelFont();
+    fctx.textAlign = "center";
+    fctx.textBaseline = "middle";
+    fctx.shadowColor = "rgba(0,0,0,0.35)";
+    slices.forEach((s, k) => {
+      const burned = opts.burned(k);
+      fctx.save();
+      fctx.translate(c, c);
+      labelAt(fctx, s, unit, c);
+      fctx.shadowBlur = burned ? 0 : 4 * dpr;
+      fctx.shadowOffsetY = burned ? 0 : 3 * dpr;
+      fctx.fillStyle = burned ? "rgba(255,255,255,0.55)" : "rgba(255,255,255,0.92)";
+      fctx.fillText(s.label, 0, 0);
+      fctx.restore();
+    });
+  }
+
+  // Dal centro della ruota al punto dell'etichetta, orientata come .seg-label.
+  function labelAt(g, s, unit, c) {
+    g.rotate((s.from + s.to) / 2 * unit - Math.PI / 2);
+    g.translate(0, -opts.labelRadius * c);  // frazione del raggio
+    g.rotate(Math.PI / 2);
+  }
+
+  function draw() {
+    const c = size / 2;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.clearRect(0, 0, size, size);
+    ctx.translate(c, c);
+    ctx.rotate((rotation * Math.PI) / 180);
+    ctx.drawImage(face, -c, -c);
+    if (active !== null) drawActive(c);
+  }
+
+  // Come .seg-label.active: l'etichetta ridisegnata sopra la faccia, dorata e con alone.
+  function drawActive(c) {
+    const s = opts.slices()[active];
+    ctx.save();
+    labelAt(ctx, s, (2 * Math.PI) / opts.total(), c);
+    ctx.font = labelFont();
+    ctx.textAlign = "center";
+    ctx.textBaseline = "middle";
+    ctx.shadowColor = "rgba(255,214,102,0.9)";
+    ctx.shadowBlur = 10 * dpr;
+    ctx.fillStyle = "#FFE08A";
+    ctx.fillText(s.label, 0, 0);
+    ctx.restore();
+  }
+
+  function resize() {
+    dpr = window.devicePixelRatio || 1;
+    const css = canvas.getBoundingClientRect().width || canvas.clientWidth;
+    const next = Math.max(1, Math.round(css * dpr));
+    if (next === size) return;
+    size = next;
+    canvas.width = face.width = size;
+    canvas.height = face.height = size;
+    paintFace();
+    draw();
+  }
+
+  function rotateTo(deg, ms, ease) {
+    if (anim) cancelAnimationFrame(anim.raf);
+    if (!ms) {
+      rotation = deg;
+      draw();
+      return Promise.resolve();
+    }
+    const from = rotation;
+    const curve = cubicBezier(...ease);
+    return new Promise(resolve => {
+      const t0 = performance.now();
+      const step = (now) => {
+        const x = Math.min(1, (now - t0) / ms);
+        rotation = from + (deg - from) * curve(x);
+        draw();
+        if (x < 1) anim.raf = requestAnimationFrame(step);
+        else { anim = null; resolve(); }
+      };
+      anim = { raf: requestAnimationFrame(step) };
+    });
+  }
+
+  if (typeof ResizeObserver !== "undefined") new ResizeObserver(resize).observe(canvas);
+
+  return {
+    mount() { resize(); },
+    // Chiamato solo quando cambia lo stato dei segmenti (un segmento bruciato).
+    repaint() { paintFace(); draw(); },
+    setActive(k) { active = k; draw(); },
+    rotateTo,
+  };
+}
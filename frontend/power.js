@@ -0,0 +1,101 @@
+// Modalità kiosk a basso consumo: le 32 luci del bordo diventano due sprite
+// pre-disegnati (lampadine "a" e "b") animati solo in opacity, quindi composti
+// dalla GPU senza repaint; l'animazione si ferma a scheda nascosta o ruota inattiva.
+
+function createBulbSprite(rim, count, radius) {
+  const layers = ["a", "b"].map(kind => {
+    const c = document.createElement("canvas");
+    c.className = "bulb-layer " + kind;
+    rim.appendChild(c);
+    return c;
+  });
+  const colors = {
+    a: ["#FFD36B", "rgba(255, 210, 110, 0.98)"],
+    b: ["#FF6B6B", "rgba(255, 105, 105, 0.92)"],
+  };
+  let drawn = "";
+
+  // Ridisegna solo se cambiano raggio o devicePixelRatio (resize, zoom).
+  function paint() {
+    const dpr = window.devicePixelRatio || 1;
+    const r = radius();
+    const key = `${r}:${dpr}`;
+    if (key === drawn) return;
+    drawn = key;
+    const half = r + 20;  // margine per il bagliore (box-shadow 12px dell'originale)
+    layers.forEach((c, k) => {
+      c.width = c.height = Math.round(2 * half * dpr);
+      c.style.width = c.style.height = `${2 * half}px`;
+      c.style.margin = `${-half}px`;
+      const ctx = c.getContext("2d");
+      const [fill, glow] = colors[k ? "b" : "a"];
+      ctx.scale(dpr, dpr);
+      ctx.fillStyle = fill;
+      ctx.shadowColor = glow;
+      ctx.shadowBlur = 12;
+      for (let i = k; i < count; i += 2) {
+        // Come .bulb: angolo 0 in alto, senso orario.
+        const a = (2 * Math.PI * i) / count - Math.PI / 2;
+        ctx.beginPath();
+        ctx.arc(half + r * Math.cos(a), half + r * Math.sin(a), 6.5, 0, 2 * Math.PI);
+        ctx.fill();
+      }
+    });
+  }
+
+  let queued = false;
+  window.addEventListener("resize", () => {
+    if (queued) return;
+    queued = true;
+    requestAnimationFrame(() => { queued = false; paint(); });
+  });
+  paint();
+  return { paint };
+}
+
+// Mette in pausa le animazioni del bordo (classe .paused) a scheda nascosta e dopo
+// idleMs senza attività; poke() le riavvia (spin, overlay, click).
+function createIdleGate(el, idleMs) {
+  let timer = null;
+
+  function update() {
+    el.classList.toggle("paused", document.hidden || timer === null);
+  }
+
+  function poke() {
+    clearTimeout(timer);
+    timer = idleMs ? setTimeout(() => { timer = null; update(); }, idleMs) : 0;
+    update();
+  }
+
+  document.addEventListener("visibilitychange", update);
+  poke();
+  return { poke };
+}
+
+// Campiona la durata dei frame per `ms` millisecondi (requestAnimationFrame) e
+// restituisce percentili e frame lunghi; serve a confrontare le due modalità.
+function sampleFrames(ms) {
+  return new Promise(resolve => {
+    const deltas = [];
+    let last = null;
+    const t0 = performance.now();
+    const step = (now) => {
+      if (last !== null) deltas.push(now - last);
+      last = now;
+      if (now - t0 < ms) { requestAnimationFrame(step); return; }
+      deltas.sort((x, y) => x - y);
+      const pick = q => (deltas.length ? deltas[Math.min(deltas.length - 1, Math.floor(q * deltas.length))] : 0);
+      resolve({
+        frames: deltas.length,
+        seconds: (now - t0) / 1000,
+        fps: deltas.length / ((now - t0) / 1000),
+        p50: pick(0.5),
+        p95: pick(0.95),
+        max: deltas.length ? deltas[deltas.length - 1] : 0,
+        long: deltas.filter(d => d > 50).length,
+      });
+    };
+    requestAnimationFrame(step);
+  });
+}
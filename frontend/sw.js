@@ -0,0 +1,58 @@
+// Service worker della modalità offline (RUOTA_OFFLINE=1): documento del componente e
+// asset restano in cache e si servono cache-first, così un reload o un calo del Wi-Fi
+// non riscaricano i media. La versione è lo hash del bundle (inserito da ruota/bundle.py):
+// bundle nuovo -> sw.js diverso -> cache nuova, le vecchie si cancellano all'activate.
+const VERSION = "__BUNDLE_HASH__";
+const CACHE = `ruota-${VERSION}`;
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (ev) => {
+  ev.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys.filter(k => k.startsWith("ruota-") && k !== CACHE).map(k => caches.delete(k))))
+      .then(() => self.clients.claim())
+  );
+});
+
+// La pagina manda la lista da precaricare: il suo URL e quelli degli asset (nomi con hash).
+self.addEventListener("message", (ev) => {
+  const urls = (ev.data && ev.data.precache) || [];
+  ev.waitUntil(caches.open(CACHE).then(async cache => {
+    for (const url of urls) {
+      if (await cache.match(url, { ignoreSearch: true })) continue;
+      try { await cache.add(url); } catch (e) {}
+    }
+  }));
+});
+
+// Nomi con lo hash del contenuto (ruota/static.py, hashed_name): in modalità static
+// stanno sotto app/static/assets/, in modalità server alla radice dell'endpoint.
+const HASHED = /\.[0-9a-f]{12}\.[A-Za-z0-9]+$/;
+
+function cacheable(req) {
+  if (req.mode === "navigate") return true;
+  const url = new URL(req.url);
+  return url.origin === self.location.origin && HASHED.test(url.pathname);
+}
+
+self.addEventListener("fetch", (ev) => {
+  const req = ev.request;
+  if (req.method !== "GET" || !cacheable(req)) return;
+  // I tag <audio> chiedono intervalli (206): rete, con la cache come riserva.
+  const ranged = req.headers.has("range");
+  ev.respondWith((async () => {
+    const cache = await caches.open(CACHE);
+    // Il documento arriva con ?streamlitUrl=...: la versione è già nel CACHE.
+    const hit = await cache.match(req, { ignoreSearch: req.mode === "navigate" });
+    if (hit && !ranged) return hit;
+    try {
+      const res = await fetch(req);
+      if (res.ok && res.status === 200) cache.put(req, res.clone());
+      return res;
+    } catch (e) {
+      if (hit) return hit;
+      throw e;
+    }
+  })());
+});
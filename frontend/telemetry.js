@@ -0,0 +1,87 @@
+// Telemetria delle prestazioni (options.telemetry = secondi fra un lotto e l'altro):
+// durate delle fasi, long task, frame persi e latenza di avvio dell'audio finiscono in
+// un ring buffer a dimensione fissa e partono verso Python a lotti (ruota/telemetry.py).
+// Spenta, gli hook chiamano stub vuoti: niente timer, niente allocazioni.
+const NOOP = () => {};
+const TELEMETRY_OFF = { span: () => NOOP, record: NOOP, frames: () => NOOP, drain: () => null };
+
+function createTelemetry(size = 512) {
+  const names = [];
+  const index = new Map();
+  const ids = new Uint16Array(size);
+  const vals = new Float32Array(size);
+  let head = 0, count = 0, lost = 0;
+  let ua = navigator.userAgent;  // spedito solo col primo lotto
+
+  function record(name, value) {
+    let id = index.get(name);
+    if (id === undefined) { id = names.length; names.push(name); index.set(name, id); }
+    ids[head] = id;
+    vals[head] = value;
+    head = (head + 1) % size;
+    if (count < size) count++;
+    else lost++;  // buffer pieno: si sovrascrive il campione più vecchio
+  }
+
+  function span(name) {
+    const t0 = performance.now();
+    return () => record(name, performance.now() - t0);
+  }
+
+  // Frame durante un'animazione: quelli lenti uno per uno (<name>.jank, ms), i frame
+  // persi come conteggio alla fine (<name>.dropped).
+  function frames(name) {
+    let last = performance.now(), dropped = 0, raf = 0, running = true;
+    const tick = (t) => {
+      if (!running) return;
+      const dt = t - last;
+      last = t;
+      if (dt > 25) { record(`${name}.jank`, dt); dropped += Math.round(dt / 16.7) - 1; }
+      raf = requestAnimationFrame(tick);
+    };
+    raf = requestAnimationFrame(tick);
+    return () => { running = false; cancelAnimationFrame(raf); record(`${name}.dropped`, dropped); };
+  }
+
+  if (typeof PerformanceObserver !== "undefined") {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(e => record("longtask", e.duration)))
+        .observe({ type: "longtask", buffered: true });
+    } catch (e) {}
+  }
+
+  // Svuota il buffer: { dev, ua?, s: [[metrica, valore], ...], lost } oppure null.
+  function drain() {
+    if (!count && !lost) return null;
+    const s = [];
+    const start = (head - count + size) % size;
+    for (let i = 0; i < count; i++) {
+      const k = (start + i) % size;
+      s.push([names[ids[k]], Math.round(vals[k] * 10) / 10]);
+    }
+    const batch = { dev: deviceId(), s, lost };
+    if (ua) { batch.ua = ua; ua = null; }
+    count = 0;
+    lost = 0;
+    return batch;
+  }
+
+  return { span, record, frames, drain };
+}
+
+// Id stabile del dispositivo (chiosco): resta nel localStorage fra un avvio e l'altro.
+let telemetryDevice = null;
+
+function deviceId() {
+  if (telemetryDevice) return telemetryDevice;
+  try {
+    telemetryDevice = localStorage.getItem("ruota-device");
+    if (!telemetryDevice) {
+      telemetryDevice = Math.random().toString(36).slice(2, 10);
+      localStorage.setItem("ruota-device", telemetryDevice);
+    }
+  } catch (e) {
+    telemetryDevice = Math.random().toString(36).slice(2, 10);
+  }
+  return telemetryDevice;
+}
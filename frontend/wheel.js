@@ -0,0 +1,753 @@
+(() => {
+  // --- CONFIG ---
+  // Giocatori e segmenti arrivano da Python (ruota/engine.py): qui si disegna soltanto.
+  let players = [];
+  let segs = [];
+  // Tabelle già calcolate da Python (ruota/geometry.py): fette, stop, etichette, rotazioni.
+  let geo = null;
+  // Tipi di decisione, come ruota/engine.py
+  const NONE = 0, GIFT = 1, MALUS = 2, SKIP = 3;
+
+  const bulbsCount = 32;
+  const NUDGE_EASE = [0.25, 0.1, 0.25, 1];  // "ease"
+  // Profilo di tempo (ruota/timing.py): arriva con le opzioni, qui i valori "ceremony".
+  let timing = {
+    spin_ms: 6000, spin_ease: [0.10, 0.75, 0.10, 1], nudge_ms: 280, nudge_step_ms: 300,
+    lock_ms: 12000, fade_out_ms: 350, fade_in_ms: 450, sfx: true,
+  };
+  let options = {};
+  // Telemetria (telemetry.js): stub vuoti finché options.telemetry non la accende.
+  let perf = TELEMETRY_OFF;
+
+  // --- DOM ---
+  const wheel = document.getElementById("wheel");
+  const face = document.getElementById("face");
+  const faceCanvas = document.getElementById("faceCanvas");
+  const labels = document.getElementById("labels");
+  const rim = document.getElementById("rim");
+  const spinBtn = document.getElementById("spinBtn");
+  const turnLabel = document.getElementById("turnLabel");
+  const remainingEl = document.getElementById("remaining");
+  const burnedMalusEl = document.getElementById("burnedMalus");
+  const assignmentsEl = document.getElementById("assignments");
+
+  const overlayGift = document.getElementById("overlayGift");
+  const giftCard = document.getElementById("giftCard");
+  const giftImg = document.getElementById("giftImg");
+  const giftNum = document.getElementById("giftNum");
+  const giftOk = document.getElementById("giftOk");
+
+  const overlayMalus = document.getElementById("overlayMalus");
+  const malusCard = document.getElementById("malusCard");
+  const malusImg = document.getElementById("malusImg");
+  const malusOk = document.getElementById("malusOk");
+  const packPickWrap = document.getElementById("packPickWrap");
+  const packPick = document.getElementById("packPick");
+
+  const bgm = document.getElementById("bgm");
+  const spinSfx = document.getElementById("spinSfx");
+  const giftSfx = document.getElementById("giftSfx");
+  const malusSfx = document.getElementById("malusSfx");
+
+
+  // --- ASSET (registro per id, caricati solo quando servono) ---
+  // Arriva da Python con il primo render del componente.
+  let ASSETS = { ids: {}, blobs: {}, variants: {} };
+
+  function assetSrc(id) { return ASSETS.blobs[ASSETS.ids[id]]; }
+  function assetVariants(id) { return ASSETS.variants[ASSETS.ids[id]] || []; }
+
+  // Varianti da `python -m ruota.optimize`: AVIF se il browser lo decodifica, altrimenti WebP.
+  let imageFormat = "image/webp";
+  const avifProbe = new Image();
+  avifProbe.onload = () => { imageFormat = "image/avif"; };
+  avifProbe.src = "data:image/avif;base64,AAAAIGZ0eXBhdmlmAAAAAGF2aWZtaWYxbWlhZk1BMUIAAADrbWV0YQAAAAAAAAAhaGRscgAAAAAAAAAAcGljdAAAAAAAAAAAAAAAAAAAAAAOcGl0bQAAAAAAAQAAAB5pbG9jAAAAAEQAAAEAAQAAAAEAAAETAAAAIQAAAChpaW5mAAAAAAABAAAAGmluZmUCAAAAAAEAAGF2MDFDb2xvcgAAAABqaXBycAAAAEtpcGNvAAAAFGlzcGUAAAAAAAAAAQAAAAEAAAAQcGl4aQAAAAADCAgIAAAADGF2MUOBAAwAAAAAE2NvbHJuY2x4AAEADQAGgAAAABdpcG1hAAAAAAAAAAEAAQQBAoMEAAAAKW1kYXQSAAoIGAAGiAhoNCAyExlHh4Yhh5555oAAAJBAyRxhQr4=";
+
+  function applyImage(img, id) {
+    const vs = assetVariants(id).filter(v => v[1] === imageFormat);
+    img.srcset = vs.map(v => `${v[0]} ${v[2]}w`).join(", ");
+    img.src = assetSrc(id);
+  }
+
+  const prefetched = new Set();
+  function prefetchImage(id, target) {
+    if (prefetched.has(id)) return;
+    prefetched.add(id);
+    const img = new Image();
+    img.decoding = "async";
+    img.sizes = target.sizes;
+    applyImage(img, id);
+  }
+
+  function audioUrl(id) {
+    const playable = assetVariants(id).find(v => bgm.canPlayType(v[1]) !== "");
+    return playable ? playable[0] : assetSrc(id);
+  }
+
+  function ensureAudioSrc(audio, id) {
+    if (audio.getAttribute("src")) return;
+    audio.src = audioUrl(id);
+    audio.load();
+  }
+
+  // Durante i 6s di giro si scaricano overlay e SFX che potrebbero servire all'arrivo.
+  function prefetchForSpin() {
+    preloadAudio("gift");
+    preloadAudio("malus");
+    prefetchImage("gift_box", giftImg);
+    malusSegs.forEach(i => { if (!isBurned(i)) prefetchImage(segs[i].img, malusImg); });
+  }
+
+  // --- STATO (vista dell'ultimo stato deciso da Python) ---
+  let rotation = 0;
+  let burned = new Set();
+  let burnedMalus = 0;
+  let order = [];
+  let turn = 0;
+  let assigned = [];
+  let remaining = 0;
+  let overlayLock = false;
+  let busy = false;
+  let activeMalusId = null;
+  let lastDecision = 0;
+
+  // --- AUDIO ---
+  // Web Audio (audio.js) se disponibile; con options.audio === "element" o senza
+  // AudioContext si usano i tag <audio> con il fade a setInterval storico.
+  let webAudio = null;
+  const sfxEls = { spin: spinSfx, gift: giftSfx, malus: malusSfx };
+
+  function preloadAudio(id) {
+    if (webAudio) webAudio.load(id).catch(() => {});
+    else ensureAudioSrc(id === "bgm" ? bgm : sfxEls[id], id);
+  }
+
+  async function playSfx(id, stopAfterMs = 0) {
+    if (!timing.sfx) return;
+    const started = perf.span(`audio.${id}`);
+    if (webAudio) { try { await webAudio.play(id, stopAfterMs); started(); } catch (e) {} return; }
+    const a = sfxEls[id];
+    try {
+      a.currentTime = 0;
+      await a.play();
+      started();
+      if (stopAfterMs) setTimeout(() => stopAudio(a), stopAfterMs);
+    } catch (e) {}
+  }
+
+  function stopSfx(id) {
+    if (webAudio) webAudio.stop(id);
+    else stopAudio(sfxEls[id]);
+  }
+
+  function fadeBgm(target, ms) {
+    if (webAudio) webAudio.fadeBgm(target, ms);
+    else fadeAudioTo(bgm, target, ms);
+  }
+
+  // Al via del giro: con Web Audio la musica resta e scende sotto gli SFX (ducking,
+  // audio.js); con i tag <audio>, che non hanno ducking, si spegne come sempre.
+  function spinBgm() {
+    if (!webAudio) fadeBgm(0.0, timing.fade_out_ms);
+  }
+
+  function startBgm() {
+    if (webAudio) { webAudio.startBgm(0.7); return; }
+    try { bgm.volume = 0.7; bgm.play().catch(() => {}); } catch (e) {}
+  }
+
+  function stopAudio(a) { try { a.pause(); a.currentTime = 0; } catch (e) {} }
+
+  function fadeAudioTo(audio, target, ms) {
+    try {
+      const start = audio.volume;
+      const delta = target - start;
+      const steps = Math.max(1, Math.floor(ms / 16));
+      let i = 0;
+      const timer = setInterval(() => {
+        i++;
+        audio.volume = Math.max(0, Math.min(1, start + delta * (i / steps)));
+        if (i >= steps) clearInterval(timer);
+      }, 16);
+    } catch (e) {}
+  }
+
+  // --- RENDER (nodi e stop creati una volta, poi si toccano solo le differenze) ---
+  function isBurned(i) { return burned.has(i); }
+
+  // Fette disegnate: una per segmento finché ci stanno (max_slices), altrimenti gruppi
+  // contigui di segmenti. Il giro punta sempre al centro del segmento estratto, che
+  // cade dentro la fetta del suo gruppo: la logica di rotazione non cambia.
+  let slices = [];   // tabella di Python + contatori vivi { burned, malusLive }
+  let sliceOf = [];  // segmento -> fetta
+  let malusSegs = [];
+
+  function buildSlices() {
+    slices = geo.slices.map(s => Object.assign({ burned: 0, malusLive: s.malus }, s));
+    sliceOf = new Array(segs.length);
+    slices.forEach((s, k) => { for (let i = s.from; i < s.to; i++) sliceOf[i] = k; });
+    malusSegs = [];
+    segs.forEach((seg, i) => { if (seg.kind === "malus") malusSegs.push(i); });
+  }
+
+  function sliceDone(k) { return slices[k].burned === slices[k].to - slices[k].from; }
+
+  // Aggiorna i contatori delle fette per i segmenti cambiati; ritorna le fette toccate.
+  function touchSlices(changed) {
+    const touched = new Set();
+    changed.forEach(i => {
+      const k = sliceOf[i];
+      const delta = isBurned(i) ? 1 : -1;
+      slices[k].burned += delta;
+      if (segs[i].kind === "malus") slices[k].malusLive -= delta;
+      touched.add(k);
+    });
+    return [...touched];
+  }
+
+  function sliceColor(k) {
+    if (sliceDone(k)) return geo.colors.burned;
+    if (slices[k].malusLive) return geo.colors.malus;
+    return slices[k].color;
+  }
+
+  const stops = [];
+  function paintGradient(changed) {
+    changed.forEach(k => { stops[k] = `${sliceColor(k)} ${slices[k].span}`; });
+    if (changed.length) face.style.background = `conic-gradient(from -90deg, ${stops.join(", ")})`;
+  }
+
+  const labelNodes = [];
+  const labelBurned = [];
+  let activeLabel = null;
+
+  // Trasformazioni pronte da Python, in unità del contenitore (cqmin): reggono il
+  // ridimensionamento senza ricalcoli. Dopo si alternano solo le classi.
+  function buildLabels() {
+    labels.style.fontSize = geo.label.css_font;
+    const frag = document.createDocumentFragment();
+    slices.forEach(slice => {
+      const div = document.createElement("div");
+      div.className = "seg-label";
+      div.textContent = slice.label;
+      div.style.transform = slice.transform;
+      labelNodes.push(div);
+      labelBurned.push(false);
+      frag.appendChild(div);
+    });
+    labels.replaceChildren(frag);
+  }
+
+  function paintLabels(changed) {
+    changed.forEach(k => {
+      const b = sliceDone(k);
+      if (labelBurned[k] !== b) { labelNodes[k].classList.toggle("burned", b); labelBurned[k] = b; }
+    });
+  }
+
+  // activeIndex è un segmento: si evidenzia la sua fetta.
+  function renderLabels(activeIndex = null) {
+    const k = (activeIndex === null) ? null : sliceOf[activeIndex];
+    if (k === activeLabel) return;
+    const done = perf.span("labels");
+    if (canvasFace) {
+      canvasFace.setActive(k);
+    } else {
+      if (activeLabel !== null) labelNodes[activeLabel].classList.remove("active");
+      if (k !== null) labelNodes[k].classList.add("active");
+    }
+    activeLabel = k;
+    done();
+  }
+
+  // options.power === "low": sprite unico per le luci e pausa da inattivi (power.js).
+  let idleGate = null;
+
+  function renderBulbs() {
+    rim.innerHTML = "";
+    if (options.power === "low") {
+      createBulbSprite(rim, bulbsCount, () => Math.min(410, 0.47 * window.innerWidth) - 15);
+      return;
+    }
+    for (let i = 0; i < bulbsCount; i++) {
+      const b = document.createElement("div");
+      b.className = "bulb " + (i % 2 === 0 ? "a" : "b");
+      const ang = 360 * i / bulbsCount;
+      b.style.transform = `rotate(${ang}deg) translateY(calc(-1 * (min(410px, 47vw) - 15px)))`;
+      rim.appendChild(b);
+    }
+  }
+
+  function currentPlayer() { return order[turn]; }
+
+  // Pannello assegnazioni virtualizzato: righe ad altezza fissa, nel DOM solo quelle
+  // visibili più un margine, riciclate a ogni scroll o aggiornamento.
+  const ROW_H = 32;
+  const OVERSCAN = 6;
+  const pool = [];
+  const rowsEl = document.createElement("div");
+  rowsEl.className = "rows";
+  assignmentsEl.appendChild(rowsEl);
+  let followTurn = -1;
+
+  function poolRow(k) {
+    if (!pool[k]) {
+      const row = document.createElement("div");
+      row.className = "row";
+      const name = document.createElement("div");
+      name.className = "p";
+      const v = document.createElement("div");
+      v.className = "v";
+      row.append(name, v);
+      rowsEl.appendChild(row);
+      pool[k] = { row, name, v, p: -1, val: null, current: false, at: -1, hidden: false };
+    }
+    return pool[k];
+  }
+
+  function renderAssignments() {
+    const n = order.length;
+    const cur = currentPlayer();
+    const height = assignmentsEl.clientHeight || ROW_H * 10;
+    rowsEl.style.height = `${n * ROW_H}px`;
+    // A ogni cambio di turno la riga corrente torna in vista se ne era uscita.
+    if (turn !== followTurn) {
+      followTurn = turn;
+      const top = turn * ROW_H;
+      const scroll = assignmentsEl.scrollTop || 0;
+      if (top < scroll || top + ROW_H > scroll + height) assignmentsEl.scrollTop = Math.max(0, top - height / 2);
+    }
+    const scroll = assignmentsEl.scrollTop || 0;
+    const first = Math.max(0, Math.floor(scroll / ROW_H) - OVERSCAN);
+    const last = Math.min(n, Math.ceil((scroll + height) / ROW_H) + OVERSCAN);
+    let k = 0;
+    for (let at = first; at < last; at++, k++) {
+      const r = poolRow(k);
+      const p = order[at];
+      const val = assigned[p];
+      const isCurrent = (p === cur) && !val;
+      if (r.p !== p) { r.name.textContent = players[p]; r.p = p; }
+      if (r.val !== val) { r.v.textContent = `${val ? "✅" : "⏳"} ${val}`; r.val = val; }
+      if (r.current !== isCurrent) { r.row.classList.toggle("current", isCurrent); r.current = isCurrent; }
+      if (r.at !== at) { r.row.style.transform = `translateY(${at * ROW_H}px)`; r.at = at; }
+      if (r.hidden) { r.row.style.display = ""; r.hidden = false; }
+    }
+    for (; k < pool.length; k++) {
+      if (!pool[k].hidden) { pool[k].row.style.display = "none"; pool[k].hidden = true; }
+    }
+  }
+
+  let scrollQueued = false;
+  assignmentsEl.addEventListener("scroll", () => {
+    if (scrollQueued) return;
+    scrollQueued = true;
+    requestAnimationFrame(() => { scrollQueued = false; renderAssignments(); });
+  }, { passive: true });
+
+  function updateUI() {
+    const done = perf.span("ui");
+    turnLabel.textContent = `Turno: ${players[currentPlayer()]}`;
+    remainingEl.textContent = String(remaining);
+    burnedMalusEl.textContent = String(burnedMalus);
+    renderAssignments();
+    spinBtn.disabled = overlayLock || busy || (remaining === 0);
+    done();
+  }
+
+  function applyView(view) {
+    const next = new Set(view.burned);
+    const changed = [];
+    next.forEach(i => { if (!burned.has(i)) changed.push(i); });
+    burned.forEach(i => { if (!next.has(i)) changed.push(i); });
+    burned = next;
+    const touched = touchSlices(changed);
+    burnedMalus = view.burned.filter(i => segs[i].kind === "malus").length;
+    order = view.order;
+    turn = view.turn;
+    assigned = view.assigned;
+    remaining = view.remaining;
+    rotation = view.rot;
+    if (canvasFace) {
+      if (touched.length) canvasFace.repaint();
+      return;
+    }
+    paintGradient(touched);
+    paintLabels(touched);
+  }
+
+  // Renderer canvas opzionale (options.renderer === "canvas"), vedi canvas.js.
+  let canvasFace = null;
+
+  function mountRenderer() {
+    if (options.renderer === "canvas") {
+      wheel.classList.add("canvas-mode");
+      canvasFace = createCanvasRenderer(faceCanvas, {
+        slices: () => slices,
+        total: () => segs.length,
+        color: sliceColor,
+        burned: sliceDone,
+        labelRadius: geo.label.radius,
+        labelFont: geo.label.font,
+      });
+      canvasFace.mount();
+      return;
+    }
+    buildLabels();
+    paintGradient(slices.map((_, k) => k));
+  }
+
+  function rotateTo(deg, ms, ease) {
+    if (canvasFace) return canvasFace.rotateTo(deg, ms, ease);
+    wheel.style.transition = ms ? `transform ${ms}ms cubic-bezier(${ease.join(", ")})` : "none";
+    wheel.style.transform = `rotate(${deg}deg)`;
+    return new Promise(r => setTimeout(r, ms));
+  }
+
+  function computeRotationForIndex(index) { return geo.rot[index]; }
+
+  // Lo stop dello SFX del giro è schedulato insieme all'avvio (clock audio con Web Audio).
+  function playSpinAudio() { return playSfx("spin", timing.spin_ms); }
+  function playGiftAudio() { return playSfx("gift"); }
+  function playMalusAudio() { return playSfx("malus"); }
+
+  // Il nudge è già deciso da Python (d.steps): qui si anima soltanto.
+  async function animateNudges(startIdx, steps) {
+    let prev = startIdx;
+    for (const idx of steps) {
+      renderLabels(prev);
+      rotation = (Math.trunc(rotation / 360) * 360) + computeRotationForIndex(idx);
+      await Promise.all([rotateTo(rotation, timing.nudge_ms, NUDGE_EASE), new Promise(r => setTimeout(r, timing.nudge_step_ms))]);
+      prev = idx;
+    }
+  }
+
+  // --- DECISIONI (arrivano da Python, il browser le mette in scena) ---
+  async function playDecision(d, view) {
+    // Anche sugli schermi che non hanno girato: niente SPIN né stato nuovo a metà animazione.
+    busy = true;
+    if (d.kind === SKIP) {
+      applyView(view);
+      renderLabels(null);
+      busy = false;
+      updateUI();
+      return;
+    }
+
+    prefetchForSpin();
+    spinBgm();
+    playSpinAudio();
+
+    renderLabels(null);
+
+    const extraSpins = 8;
+    const currentMod = ((rotation % 360) + 360) % 360;
+    const targetMod = computeRotationForIndex(d.start);
+    const delta = (360 + targetMod - currentMod) % 360;
+    rotation = rotation + extraSpins * 360 + delta;
+
+    const spun = perf.span("spin");
+    const framesDone = perf.frames("spin");
+    await rotateTo(rotation, timing.spin_ms, timing.spin_ease);
+    spun();
+    if (d.steps.length) {
+      const nudged = perf.span("nudge");
+      await animateNudges(d.start, d.steps);
+      nudged();
+    }
+    framesDone();
+
+    applyView(view);
+    busy = false;
+    if (d.kind === NONE) {
+      renderLabels(null);
+      fadeBgm(0.7, timing.fade_in_ms);
+      updateUI();
+      return;
+    }
+
+    renderLabels(d.final);
+    const seg = segs[d.final];
+    if (d.kind === GIFT) {
+      await playGiftAudio();
+      showGiftOverlay(seg.label);
+      return;
+    }
+    await playMalusAudio();
+    showMalusOverlay(seg);
+    updateUI();
+  }
+
+  function showGiftOverlay(prizeLabel, lockMs = timing.lock_ms) {
+    const done = perf.span("overlay.show");
+    overlayLock = true;
+    spinBtn.disabled = true;
+    giftNum.textContent = prizeLabel;
+    if (!giftImg.getAttribute("src")) applyImage(giftImg, "gift_box");
+    overlayGift.classList.add("show");
+    giftCard.classList.remove("pop");
+    void giftCard.offsetWidth;
+    giftCard.classList.add("pop");
+    giftOk.disabled = true;
+    setTimeout(() => { giftOk.disabled = false; }, lockMs);
+    done();
+  }
+
+  function hideGiftOverlay() {
+    const done = perf.span("overlay.hide");
+    overlayGift.classList.remove("show");
+    giftCard.classList.remove("pop");
+    overlayLock = false;
+    updateUI();
+    done();
+  }
+
+  function showMalusOverlay(malusSeg, lockMs = timing.lock_ms) {
+    const done = perf.span("overlay.show");
+    overlayLock = true;
+    spinBtn.disabled = true;
+    activeMalusId = malusSeg.id;
+    applyImage(malusImg, malusSeg.img);
+    overlayMalus.classList.add("show");
+    malusCard.classList.remove("pop");
+    void malusCard.offsetWidth;
+    malusCard.classList.add("pop");
+    packPickWrap.style.display = "none";
+    packPick.value = "";
+    malusOk.disabled = true;
+    setTimeout(() => {
+      if (malusSeg.id === "MALUS_2") {
+        packPickWrap.style.display = "grid";
+        packPick.focus();
+      }
+      malusOk.disabled = false;
+    }, lockMs);
+    done();
+  }
+
+  function hideMalusOverlay() {
+    const done = perf.span("overlay.hide");
+    overlayMalus.classList.remove("show");
+    malusCard.classList.remove("pop");
+    packPickWrap.style.display = "none";
+    overlayLock = false;
+    updateUI();
+    done();
+  }
+
+  function resumeBgm() {
+    startBgm();
+    fadeBgm(0.7, timing.fade_in_ms);
+  }
+
+  giftOk.addEventListener("click", () => {
+    stopSfx("gift");
+    hideGiftOverlay();
+    send({ t: "ok", decision: lastDecision });
+    resumeBgm();
+  });
+
+  malusOk.addEventListener("click", () => {
+    // MALUS_2: il pacco lo valida Python; l'overlay si chiude quando arriva lo stato nuovo.
+    if (activeMalusId === "MALUS_2") {
+      malusOk.disabled = true;
+      send({ t: "ok", decision: lastDecision, pack: (packPick.value || "").trim() });
+      packSeq = seq;
+      return;
+    }
+    stopSfx("malus");
+    hideMalusOverlay();
+    send({ t: "ok", decision: lastDecision });
+    resumeBgm();
+  });
+
+  // --- SYNC CON PYTHON (intenti in uscita, stato + decisioni in entrata) ---
+  let seq = 0;
+  const outbox = [];
+  let mounted = false;
+  // Layout, asset e opzioni arrivano solo finché Python non sa che li abbiamo montati:
+  // il token torna indietro con ogni valore, poi viaggiano solo vista e decisioni.
+  let mountToken = null;
+  // seq dell'OK con il pacco in attesa di risposta: altri intenti (perf) possono seguirlo.
+  let packSeq = 0;
+  // seq del nostro SPIN finché non arriva una decisione o il rifiuto di Python.
+  let spinSeq = 0;
+
+  function post() {
+    Bridge.setValue({ events: outbox, mounted: mountToken });
+  }
+
+  // L'outbox resta finché Python non conferma (ack): i rerun accorpati non perdono intenti.
+  function send(intent) {
+    intent.seq = ++seq;
+    outbox.push(intent);
+    post();
+  }
+
+  // --- TELEMETRIA (options.telemetry, vedi telemetry.js) ---
+  // Il lotto viaggia come un intento qualsiasi (outbox + ack), mai durante un giro.
+  let spinSent = 0;
+
+  function flushPerf() {
+    if (busy) return;
+    const batch = perf.drain();
+    if (batch) send(Object.assign({ t: "perf" }, batch));
+  }
+
+  // --- OFFLINE (options.offline, service worker in sw.js) ---
+  // Senza rete gli intenti restano nell'outbox e si rispediscono al ritorno; il documento
+  // e gli asset (nomi con hash) arrivano dalla cache del service worker.
+  function setupOffline() {
+    const topbar = document.querySelector(".topbar");
+    const mark = () => topbar.classList.toggle("offline", !navigator.onLine);
+    window.addEventListener("offline", mark);
+    window.addEventListener("online", () => {
+      mark();
+      if (outbox.length) post();
+    });
+    mark();
+    if (!("serviceWorker" in navigator)) return;
+    const warm = !!navigator.serviceWorker.controller;
+    navigator.serviceWorker.register("sw.js").then(() => navigator.serviceWorker.ready).then(reg => {
+      const urls = [location.href.split("?")[0]];
+      Object.values(ASSETS.blobs || {}).forEach(src => urls.push(src));
+      Object.values(ASSETS.variants || {}).forEach(list => list.forEach(v => urls.push(v[0])));
+      reg.active.postMessage({ precache: urls.filter(u => !u.startsWith("data:")).map(u => new URL(u, location.href).href) });
+    }).catch(() => {});
+    window.addEventListener("load", () => setTimeout(() => reportLoad(warm), 0));
+  }
+
+  // Tempi di caricamento a cache fredda (primo avvio) o calda (documento già
+  // controllato dal service worker): byte arrivati dalla rete e dalla cache.
+  function reportLoad(warm) {
+    const nav = performance.getEntriesByType("navigation")[0];
+    if (!nav) return;
+    const res = performance.getEntriesByType("resource");
+    const stats = {
+      cache: warm ? "warm" : "cold",
+      document_ms: Math.round(nav.responseEnd - nav.startTime),
+      load_ms: Math.round(nav.loadEventEnd - nav.startTime),
+      network_bytes: res.reduce((n, r) => n + (r.transferSize || 0), nav.transferSize || 0),
+      cached_resources: res.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+      resources: res.length,
+    };
+    window.ruotaLoadStats = stats;
+    console.info("ruota load stats", JSON.stringify(stats));
+  }
+
+  // Ripristino dopo un remount dell'iframe: nessuna animazione, overlay riaperto se pendente.
+  function restore(args) {
+    applyView(args.view);
+    seq = args.ack;
+    lastDecision = args.decision ? args.decision.id : 0;
+    rotateTo(rotation, 0);
+    if (args.view.pending >= 0) {
+      const seg = segs[args.view.pending];
+      if (seg.kind === "prize") showGiftOverlay(seg.label, 0);
+      else showMalusOverlay(seg, 0);
+    }
+  }
+
+  function onRender(args) {
+    while (outbox.length && outbox[0].seq <= args.ack) outbox.shift();
+    if (!mounted) {
+      // iframe rimontato dopo la conferma del mount: si chiede di nuovo il layout.
+      if (!args.layout) { post(); return; }
+      mounted = true;
+      mountToken = args.mount;
+      ASSETS = args.assets;
+      players = args.layout.players;
+      segs = args.layout.segs;
+      geo = args.layout.geometry;
+      buildSlices();
+      options = args.options;
+      if (options.timing) timing = options.timing;
+      mountRenderer();
+      restore(args);
+      init();
+      post();
+      return;
+    }
+    // Ruota o asset cambiati sotto i piedi (altra ?wheel=, asset ottimizzati): si rimonta da capo.
+    if (args.mount !== mountToken) {
+      location.reload();
+      return;
+    }
+
+    if (args.error && packSeq && args.error.id === packSeq) {
+      packSeq = 0;
+      alert(args.error.msg);
+      malusOk.disabled = false;
+      return;
+    }
+    // SPIN rifiutato (un altro schermo ha girato per primo, partita finita): si sblocca;
+    // la decisione dell'altro schermo, se c'è, arriva qui sotto come per tutti.
+    if (args.error && spinSeq && args.error.id === spinSeq) {
+      spinSeq = 0;
+      spinSent = 0;
+      busy = false;
+    }
+    // Python manda sempre l'ultima decisione: un id diverso da quello visto è nuovo.
+    const d = args.decision;
+    if (d && d.id !== lastDecision) {
+      lastDecision = d.id;
+      spinSeq = 0;
+      if (spinSent) { perf.record("spin.rtt", performance.now() - spinSent); spinSent = 0; }
+      playDecision(d, args.view);
+      return;
+    }
+    if (busy) return;
+    if (overlayMalus.classList.contains("show") && args.view.pending < 0) {
+      stopSfx("malus");
+      hideMalusOverlay();
+      resumeBgm();
+    }
+    applyView(args.view);
+    renderLabels(null);
+    updateUI();
+  }
+
+  function poke() { if (idleGate) idleGate.poke(); }
+
+  function init() {
+    // turbo: niente transizioni CSS (overlay, pop delle card, luci).
+    if (!timing.spin_ms) document.body.classList.add("turbo");
+    if (options.offline) setupOffline();
+    if (options.telemetry) {
+      perf = createTelemetry();
+      setInterval(flushPerf, options.telemetry * 1000);
+    }
+    if (options.power === "low") {
+      document.body.classList.add("low-power");
+      idleGate = createIdleGate(rim, (options.idle_seconds || 0) * 1000);
+      document.addEventListener("pointerdown", poke);
+    }
+    if (options.audio !== "element") webAudio = createWebAudio(audioUrl);
+    if (webAudio) bgm.removeAttribute("autoplay");
+    preloadAudio("bgm");
+    renderBulbs();
+    updateUI();
+    spinBtn.addEventListener("click", () => {
+      if (overlayLock || busy) return;
+      startBgm();
+      poke();
+      busy = true;
+      spinBtn.disabled = true;
+      spinSent = performance.now();
+      send({ t: "spin" });
+      spinSeq = seq;
+    });
+    // Lo SFX del giro serve al primo click: lo si carica dopo il primo frame.
+    setTimeout(() => preloadAudio("spin"), 0);
+    if (options.measure) {
+      sampleFrames(options.measure * 1000).then(stats => {
+        stats.mode = options.power;
+        window.ruotaFrameStats = stats;
+        console.info("ruota frame stats", JSON.stringify(stats));
+      });
+    }
+  }
+
+  Bridge.onRender(onRender);
+  Bridge.ready();
+  Bridge.setFrameHeight(900);
+})();
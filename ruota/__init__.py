@@ -0,0 +1 @@
+# Moduli di supporto per la Ruota Regali (app.py resta l'entrypoint Streamlit).
@@ -0,0 +1,82 @@
+import base64
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+
+# Tetto di memoria per le stringhe base64 tenute in cache (MB, configurabile da env).
+DEFAULT_MAX_MB = int(os.environ.get("RUOTA_ASSET_CACHE_MB", "64"))
+
+
+class _Entry(NamedTuple):
+    key: Tuple[int, int]  # (mtime_ns, size) del file sorgente
+    data: str
+    nbytes: int
+
+
+class AssetCache:
+    """Cache di processo degli asset in base64, condivisa da tutte le sessioni.
+
+    Le voci sono indicizzate per path e invalidate quando cambiano mtime o
+    dimensione del file (hot reload). Oltre ``max_bytes`` si scartano le voci
+    usate meno di recente.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def b64(self, path: str) -> str:
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        key = (info.st_mtime_ns, info.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.key == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.data
+
+        # Codifica fuori dal lock: sessioni diverse non si bloccano a vicenda.
+        with open(path, "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+
+        with self._lock:
+            self.misses += 1
+            current = self._entries.get(path)
+            if current is not None and current.key == key:
+                # Un'altra sessione l'ha appena inserita: si condivide quella copia.
+                return current.data
+            if current is not None:
+                self._bytes -= self._entries.pop(path).nbytes
+            if len(data) <= self.max_bytes:
+                self._entries[path] = _Entry(key, data, len(data))
+                self._bytes += len(data)
+                while self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= old.nbytes
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Istanza unica per processo: i moduli importati sopravvivono ai rerun di Streamlit.
+asset_cache = AssetCache()
@@ -0,0 +1,302 @@
+"""Benchmark e controllo regressioni: server, payload, memoria e (se c'è) browser headless.
+
+Uso: ``python -m ruota.bench [--runs 20] [--browser] [--history bench_history.json]``
+
+- server: tempo di run di ``app.py`` con ``AppTest`` (primo run a freddo, run a
+  caldo, run con uno spin), come li vive Streamlit a ogni interazione;
+- payload: byte degli argomenti del componente per viewer (al mount e a regime,
+  quando layout e asset non viaggiano più), tabella asset (anche in modalità
+  inline, per confronto) e bundle del frontend (raw/gzip/brotli);
+- memoria: tabella asset condivisa, stato per sessione (a regime: la tabella è
+  condivisa e si misura a parte), RSS del processo;
+- browser (``--browser``, richiede Playwright + Chromium): first paint, tempo
+  fino a #spinBtn cliccabile e durata dei frame durante giro e nudge.
+
+Ogni esecuzione si aggiunge allo storico JSON. Si fallisce (exit 1) se una metrica
+supera la soglia assoluta o peggiora troppo rispetto alla mediana delle ultime
+esecuzioni nello storico.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+DEFAULT_HISTORY = os.path.join(ROOT, "bench_history.json")
+
+# Soglie assolute (massimi). Le metriche assenti da qui sono solo registrate.
+THRESHOLDS = {
+    "server.cold_ms": 3000,
+    "server.warm_p50_ms": 150,
+    "server.spin_p50_ms": 150,
+    "payload.args_bytes": 16_000,
+    "payload.steady_args_bytes": 2_000,
+    "bundle.html_bytes": 60_000,
+    "bundle.gz_bytes": 20_000,
+    "memory.session_bytes": 8_000,
+    "browser.spin_ready_ms": 8000,
+    "browser.first_paint_ms": 3000,
+    "browser.spin_frame_p95_ms": 34,
+    "browser.spin_long_frames": 5,
+}
+# Peggioramento massimo rispetto alla mediana delle ultime BASELINE_RUNS esecuzioni: i byte
+# sono deterministici, i tempi rumorosi. Sotto MIN_DELTA non è una regressione: su mediane
+# di ~10 ms il solo rumore di una macchina ferma vale il doppio.
+TOLERANCE = {"bytes": 0.10, "ms": 0.50}
+MIN_DELTA = {"bytes": 0, "ms": 10}
+BASELINE_RUNS = 5
+MEDIA = (".mp3", ".ogg", ".png", ".jpg", ".webp")
+
+
+def bench_server(runs: int) -> Dict[str, float]:
+    from streamlit.testing.v1 import AppTest
+
+    def run(at: "AppTest") -> float:
+        t0 = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - t0) * 1000
+        if at.exception:
+            raise RuntimeError(f"app.py ha sollevato: {at.exception}")
+        return elapsed
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    cold = run(at)
+    args = at.get("component_instance")[0].proto.json_args
+    warm = [run(at) for _ in range(runs)]
+
+    # Spin: ogni run porta un intento nuovo, poi l'OK (con un pacco libero) chiude l'overlay.
+    # Come un browser che ha già montato: il token torna indietro, layout e asset non viaggiano più.
+    from ruota.engine import _first_free_pack
+
+    mounted = json.loads(args)["mount"]
+
+    target = at.session_state["ruota:session"]["wheel"]
+    spin, seq = [], 0
+    for _ in range(runs):
+        if target.engine.finished():
+            target.new_game()
+        seq += 1
+        at.session_state["ruota"] = {"events": [{"t": "spin", "seq": seq}], "mounted": mounted}
+        spin.append(run(at))
+        seq += 1
+        pack = _first_free_pack(target.engine)
+        ok = {"t": "ok", "seq": seq, "pack": pack, "decision": target.decision["id"]}
+        at.session_state["ruota"] = {"events": [ok], "mounted": mounted}
+        run(at)
+
+    return {
+        "server.cold_ms": round(cold, 1),
+        "server.warm_p50_ms": round(statistics.median(warm), 2),
+        "server.warm_max_ms": round(max(warm), 2),
+        "server.spin_p50_ms": round(statistics.median(spin), 2),
+        "payload.args_bytes": len(args),
+        "payload.steady_args_bytes": len(at.get("component_instance")[0].proto.json_args),
+    }
+
+
+def bench_payload() -> Dict[str, float]:
+    from ruota.bundle import ensure_bundle
+    from ruota.component import COMPONENT_STATIC_URL, host
+    from ruota.hosting import deep_size, rss_bytes
+    from ruota.registry import AssetRegistry
+
+    out: Dict[str, float] = {}
+    assets_dir = os.path.join(ROOT, "assets")
+    files = sorted(f for f in os.listdir(assets_dir) if os.path.splitext(f)[1] in MEDIA)
+    for mode in ("static", "inline"):
+        registry = AssetRegistry(mode=mode, static_url=COMPONENT_STATIC_URL)
+        for name in files:
+            registry.add(os.path.splitext(name)[0], os.path.join(assets_dir, name))
+        table = registry.table()
+        suffix = "" if mode == "static" else "_inline"
+        out[f"payload.assets{suffix}_bytes"] = len(json.dumps(table, separators=(",", ":")))
+        out[f"memory.assets{suffix}_bytes"] = deep_size(table)
+
+    bundle = ensure_bundle()
+    out["bundle.sources_bytes"] = bundle["bytes"]["sources"]
+    out["bundle.html_bytes"] = bundle["bytes"]["html"]
+    out["bundle.gz_bytes"] = bundle["bytes"]["gz"]
+    if "br" in bundle["bytes"]:
+        out["bundle.br_bytes"] = bundle["bytes"]["br"]
+
+    stats = host().stats()
+    sessions = stats["per_session"]
+    if sessions:
+        out["memory.session_bytes"] = max(s["state_bytes"] + s["payload_bytes"] for s in sessions)
+    out["memory.rss_bytes"] = rss_bytes()
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _seed_journal(path: str, left: int = 3) -> None:
+    """Partita quasi finita nel giornale: il giro misurato avrà quasi certamente dei nudge."""
+    from ruota.engine import MALUS, MALUS_2, Engine, _first_free_pack
+    from ruota.hosting import DEFAULT_WHEEL, load_wheels
+    from ruota.journal import OK, SPIN, Journal, game_id
+
+    layout = load_wheels()[DEFAULT_WHEEL]
+    journal, game = Journal(path), game_id(DEFAULT_WHEEL, layout)
+    engine = Engine(layout, rng=random.Random(1), selection="direct")
+    while engine.remaining_prizes() > left:
+        outcome = engine.spin()
+        journal.append(game, engine, SPIN, str(outcome.start))
+        if engine.state.pending >= 0:
+            pack = None
+            if outcome.kind == MALUS and layout.seg_id(outcome.final) == MALUS_2:
+                pack = _first_free_pack(engine)
+            engine.confirm(pack)
+            journal.append(game, engine, OK, pack)
+    journal.close()
+
+
+def bench_browser(timeout: float = 90) -> Dict[str, float]:
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        raise RuntimeError("playwright non installato (pip install playwright && playwright install chromium)")
+
+    port = _free_port()
+    tmp = tempfile.mkdtemp(prefix="ruota-bench-")
+    journal = os.path.join(tmp, "bench.db")
+    _seed_journal(journal)
+    env = dict(os.environ, RUOTA_JOURNAL=journal, RUOTA_SELECTION="nudge")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless=true",
+         f"--server.port={port}", "--browser.gatherUsageStats=false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/"
+    try:
+        deadline = time.time() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(url + "_stcore/health", timeout=1)
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError("il server Streamlit non è partito")
+                time.sleep(0.2)
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page(viewport={"width": 1280, "height": 900})
+            t0 = time.perf_counter()
+            page.goto(url)
+            frame = page.wait_for_selector("iframe", timeout=timeout * 1000).content_frame()
+            frame.wait_for_selector("#spinBtn:not([disabled])", timeout=timeout * 1000)
+            ready = (time.perf_counter() - t0) * 1000
+            paint = frame.evaluate(
+                "() => (performance.getEntriesByName('first-contentful-paint')[0] || {}).startTime || 0")
+            # Campionatore di power.js: giro lungo (6 s) più i nudge.
+            frame.evaluate("() => { window.__benchFrames = sampleFrames(8000); }")
+            frame.click("#spinBtn")
+            frames = frame.evaluate("() => window.__benchFrames")
+            browser.close()
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {
+        "browser.spin_ready_ms": round(ready, 1),
+        "browser.first_paint_ms": round(paint, 1),
+        "browser.spin_frame_p50_ms": round(frames["p50"], 2),
+        "browser.spin_frame_p95_ms": round(frames["p95"], 2),
+        "browser.spin_frame_max_ms": round(frames["max"], 2),
+        "browser.spin_long_frames": frames["long"],
+    }
+
+
+def baseline(history: List[Dict], runs: int = BASELINE_RUNS) -> Dict[str, float]:
+    """Mediana di ogni metrica nelle ultime ``runs`` esecuzioni dello storico."""
+    values: Dict[str, List[float]] = {}
+    for entry in history[-runs:]:
+        for name, value in entry.get("metrics", {}).items():
+            values.setdefault(name, []).append(value)
+    return {name: statistics.median(v) for name, v in values.items()}
+
+
+def check(metrics: Dict[str, float], previous: Optional[Dict[str, float]],
+          thresholds: Dict[str, float]) -> List[str]:
+    """Soglie assolute e peggioramenti rispetto a ``previous`` (vedi ``baseline``)."""
+    failures = []
+    for name, value in metrics.items():
+        limit = thresholds.get(name)
+        if limit is not None and value > limit:
+            failures.append(f"{name} = {value} oltre la soglia {limit}")
+        kind = "bytes" if name.endswith("_bytes") else "ms" if name.endswith("_ms") else None
+        old = (previous or {}).get(name)
+        # RSS e massimi si registrano soltanto: un run lento o un GC in ritardo li spostano.
+        compared = kind and not name.startswith("memory.rss") and "_max_" not in name
+        if compared and old and value > old * (1 + TOLERANCE[kind]) and value - old > MIN_DELTA[kind]:
+            failures.append(f"{name} = {value} peggiorato oltre il {TOLERANCE[kind]:.0%} "
+                            f"rispetto alla mediana {old}")
+    return failures
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--browser", action="store_true", help="misura anche nel browser headless")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--thresholds", default=None, help="file JSON che sovrascrive le soglie")
+    args = parser.parse_args(argv)
+
+    # Giornale sempre in un file temporaneo, anche se RUOTA_JOURNAL è impostato: il
+    # benchmark gioca e azzera partite, non deve mai toccare quella vera.
+    os.environ["RUOTA_JOURNAL"] = os.path.join(tempfile.mkdtemp(prefix="ruota-bench-"), "j.db")
+    os.chdir(ROOT)
+    metrics = bench_server(args.runs)
+    metrics.update(bench_payload())
+    skipped = {}
+    if args.browser:
+        try:
+            metrics.update(bench_browser())
+        except Exception as exc:  # browser assente o non avviabile: si registra, non si fallisce
+            skipped["browser"] = str(exc).splitlines()[0]
+
+    thresholds = dict(THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds.update(json.load(f))
+    try:
+        with open(args.history) as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        history = []
+    failures = check(metrics, baseline(history), thresholds)
+
+    entry = {"when": time.strftime("%Y-%m-%dT%H:%M:%S"), "rev": _git_rev(), "metrics": metrics,
+             "skipped": skipped, "failures": failures}
+    history.append(entry)
+    with open(args.history, "w") as f:
+        json.dump(history, f, indent=2)
+
+    print(json.dumps(entry, indent=2))
+    for failure in failures:
+        print(f"REGRESSIONE: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Bundle del frontend: index.html con CSS e JS minificati inline, in un solo file versionato.
+
+Uso: ``python -m ruota.bundle [--src frontend] [--out frontend/dist]``
+
+Produce ``index.html`` più le varianti ``.gz`` e ``.br`` (se il modulo ``brotli``
+è installato) e ``bundle.json`` con hash del contenuto e dimensioni. Il bundle si
+ricostruisce da solo all'avvio se i sorgenti cambiano (``ensure_bundle``); a ogni
+run Streamlit non si assembla nessuna stringa.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # opzionale: senza, solo gzip
+    brotli = None
+
+from ruota.files import load_json, write_atomic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, "frontend")
+OUT_DIR = os.path.join(SRC_DIR, "dist")
+MANIFEST = "bundle.json"
+SW = "sw.js"  # service worker della modalità offline, versionato con lo hash del bundle
+
+_STYLE_TAG = re.compile(r'<link rel="stylesheet" href="([^"]+)"\s*/?>')
+_SCRIPT_TAG = re.compile(r'<script src="([^"]+)"></script>\s*')
+# Dopo queste parole chiave "/" apre una regex, non una divisione.
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "yield"}
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """Minificatore prudente: toglie commenti e indentazione, lascia gli a capo (ASI).
+
+    Stringhe, template literal e regex restano intatti.
+    """
+    out: List[str] = []
+    i, n = 0, len(js)
+    prev = ""  # ultimo token significativo emesso, per distinguere regex e divisione
+    while i < n:
+        c = js[i]
+        if c.isalnum() or c in "_$":
+            j = i
+            while j < n and (js[j].isalnum() or js[j] in "_$"):
+                j += 1
+            out.append(js[i:j])
+            prev, i = js[i:j], j
+        elif c in "\"'`":
+            j = _skip_string(js, i)
+            out.append(js[i:j])
+            prev, i = c, j
+        elif js.startswith("//", i):
+            i = js.find("\n", i)
+            i = n if i < 0 else i
+        elif js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif c == "/" and (not prev or prev in _REGEX_KEYWORDS or prev in "(,=:[!&|?{};+-*%<>~^"):
+            j = _skip_regex(js, i)
+            out.append(js[i:j])
+            prev, i = "/", j
+        else:
+            out.append(c)
+            if not c.isspace():
+                prev = c
+            i += 1
+    lines = (line.strip() for line in "".join(out).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _skip_string(js: str, i: int) -> int:
+    quote, j, depth = js[i], i + 1, 0
+    while j < len(js):
+        c = js[j]
+        if c == "\\":
+            j += 2
+            continue
+        if quote == "`" and js.startswith("${", j):
+            depth += 1
+            j += 2
+            continue
+        if quote == "`" and depth and c == "}":
+            depth -= 1
+        elif quote == "`" and depth and c in "\"'`":
+            j = _skip_string(js, j)
+            continue
+        elif c == quote and not depth:
+            return j + 1
+        j += 1
+    return j
+
+
+def _skip_regex(js: str, i: int) -> int:
+    j, in_class = i + 1, False
+    while j < len(js) and js[j] != "\n":
+        c = js[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            j += 1
+            while j < len(js) and js[j].isalpha():
+                j += 1
+            return j
+        j += 1
+    return j
+
+
+def _sources(src_dir: str) -> List[str]:
+    with open(os.path.join(src_dir, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    return ["index.html"] + _STYLE_TAG.findall(html) + _SCRIPT_TAG.findall(html) + [SW]
+
+
+def sources_digest(src_dir: str = SRC_DIR) -> str:
+    h = hashlib.sha256()
+    for name in _sources(src_dir):
+        with open(os.path.join(src_dir, name), "rb") as f:
+            h.update(name.encode() + b"\0" + f.read())
+    return h.hexdigest()
+
+
+def render(src_dir: str = SRC_DIR) -> str:
+    """index.html con il CSS e tutti gli script (nell'ordine originale) inline e minificati."""
+    def read(name: str) -> str:
+        with open(os.path.join(src_dir, name), encoding="utf-8") as f:
+            return f.read()
+
+    html = read("index.html")
+    scripts = _SCRIPT_TAG.findall(html)
+    html = _STYLE_TAG.sub(lambda m: f"<style>{minify_css(read(m.group(1)))}</style>", html)
+    html = _SCRIPT_TAG.sub("", html)
+    html = re.sub(r">\s+<", "><", html.strip())
+    js = ";\n".join(minify_js(read(name)) for name in scripts)
+    # "</" dentro una stringa JS chiuderebbe il tag script in anticipo.
+    js = js.replace("</", "<\\/")
+    return html.replace("</body>", f"<script>{js}</script></body>")
+
+
+def build(src_dir: str = SRC_DIR, out_dir: str = OUT_DIR) -> Dict:
+    t0 = time.perf_counter()
+    html = render(src_dir).encode("utf-8")
+    content_hash = hashlib.sha256(html).hexdigest()[:12]
+    # Lo hash entra nel documento: il service worker (offline) lo usa come versione.
+    html = html.replace(b"<head>", f'<head><meta name="ruota-bundle" content="{content_hash}">'.encode(), 1)
+    variants = {"": html, ".gz": gzip.compress(html, 9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(html, quality=11)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for suffix, data in variants.items():
+        write_atomic(os.path.join(out_dir, "index.html" + suffix), data)
+    with open(os.path.join(src_dir, SW), encoding="utf-8") as f:
+        sw = minify_js(f.read()).replace("__BUNDLE_HASH__", content_hash)
+    write_atomic(os.path.join(out_dir, SW), sw.encode("utf-8"))
+    raw = sum(os.path.getsize(os.path.join(src_dir, name)) for name in _sources(src_dir) if name != SW)
+    manifest = {
+        "version": 1,
+        "hash": content_hash,
+        "sources": sources_digest(src_dir),
+        "bytes": {"sources": raw, "html": len(html), **{k[1:]: len(v) for k, v in variants.items() if k}},
+        "requests": {"sources": len(_sources(src_dir)) - 1, "bundle": 1},
+        "build_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+    write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def load(out_dir: str = OUT_DIR) -> Dict:
+    """bundle.json letto da disco e tenuto in memoria finché non cambia."""
+    return load_json(os.path.join(out_dir, MANIFEST))
+
+
+def ensure_bundle(src_dir: str = SRC_DIR, out_dir: str = OUT_DIR) -> Dict:
+    """Bundle aggiornato: riusa quello su disco se i sorgenti non sono cambiati."""
+    manifest = load(out_dir)
+    if manifest.get("sources") == sources_digest(src_dir) and os.path.exists(os.path.join(out_dir, "index.html")):
+        return manifest
+    return build(src_dir, out_dir)
+
+
+def publish_bundle(manifest: Dict, out_dir: str = OUT_DIR) -> str:
+    """Copia il bundle (e le varianti compresse) in static/assets come ruota.<hash>.html.
+
+    Il service worker va accanto con nome fisso (sw.js): il browser lo riconfronta a ogni visita.
+    """
+    from ruota.static import STATIC_DIR
+
+    name = f"ruota.{manifest['hash']}.html"
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    for suffix in ("", ".gz", ".br"):
+        src, target = os.path.join(out_dir, "index.html" + suffix), os.path.join(STATIC_DIR, name + suffix)
+        if os.path.exists(src) and not os.path.exists(target):
+            with open(src, "rb") as f:
+                write_atomic(target, f.read())
+    with open(os.path.join(out_dir, SW), "rb") as f:
+        write_atomic(os.path.join(STATIC_DIR, SW), f.read())
+    return name
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--src", default=SRC_DIR)
+    parser.add_argument("--out", default=OUT_DIR)
+    args = parser.parse_args(argv)
+    print(json.dumps(build(args.src, args.out), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
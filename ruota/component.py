@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from ruota.bundle import OUT_DIR as BUNDLE_DIR
+from ruota.bundle import ensure_bundle, publish_bundle
+from ruota.hosting import Host, Wheel, load_wheels
+from ruota.journal import DEFAULT_PATH as JOURNAL_PATH
+from ruota.journal import OK, SPIN, Journal
+from ruota.static import ASSET_MODE, ASSET_URL, STATIC_URL, ensure_server
+from ruota.timing import DEFAULT_PROFILE, profile
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+# Il componente è servito da <base>/component/<nome>/index.html: si risale di due livelli.
+COMPONENT_STATIC_URL = "../../" + STATIC_URL
+
+# Renderer della faccia: "dom" (conic-gradient + etichette) o "canvas" (vedi frontend/canvas.js).
+RENDERER = os.environ.get("RUOTA_RENDERER", "dom")
+# Audio: "webaudio" (buffer decodificati + rampe GainNode) o "element" (tag <audio>).
+AUDIO = os.environ.get("RUOTA_AUDIO", "webaudio")
+# Consumo: "full" (luci originali) o "low" (sprite in sola opacity, pausa dopo
+# RUOTA_IDLE_SECONDS senza attività o a scheda nascosta), vedi frontend/power.js.
+POWER = os.environ.get("RUOTA_POWER", "full")
+IDLE_SECONDS = int(os.environ.get("RUOTA_IDLE_SECONDS", "30"))
+# Secondi di campionamento dei frame all'avvio (0 = spento), risultato in console.
+MEASURE_SECONDS = int(os.environ.get("RUOTA_MEASURE_SECONDS", "0"))
+# Modalità offline: service worker che tiene in cache bundle e asset (frontend/sw.js).
+OFFLINE = os.environ.get("RUOTA_OFFLINE", "0") == "1"
+# Telemetria del frontend: secondi fra un lotto e l'altro (0 = spenta), vedi ruota/telemetry.py.
+TELEMETRY_SECONDS = int(os.environ.get("RUOTA_TELEMETRY", "0"))
+
+# Bundle unico minificato (ruota/bundle.py), ricostruito all'avvio se i sorgenti cambiano;
+# RUOTA_BUNDLE=0 serve i sorgenti di frontend/ così come sono (sviluppo).
+USE_BUNDLE = os.environ.get("RUOTA_BUNDLE", "1") != "0"
+
+# Ultima tabella asset vista e la sua impronta (la tabella è condivisa: si ricalcola solo se cambia).
+_assets_key: tuple = (None, "")
+
+
+def _declare():
+    if not USE_BUNDLE:
+        return components.declare_component("ruota", path=FRONTEND_DIR)
+    manifest = ensure_bundle()
+    if ASSET_MODE == "server":
+        # Dall'endpoint con cache lunga (RUOTA_ASSET_URL): nome con hash, varianti br/gzip
+        # precalcolate. Senza URL o con la porta occupata ensure_server() solleva.
+        ensure_server()
+        return components.declare_component("ruota", url=ASSET_URL + publish_bundle(manifest))
+    return components.declare_component("ruota", path=BUNDLE_DIR)
+
+
+_component = _declare()
+
+
+@st.cache_resource
+def host() -> Host:
+    """Ruote del processo (RUOTA_WHEELS), condivise da tutte le sessioni."""
+    return Host(load_wheels(), Journal(JOURNAL_PATH) if JOURNAL_PATH else None)
+
+
+def new_session(target: Wheel) -> Dict:
+    # La partita sta nella ruota (condivisa); qui solo lo stato del canale con il browser.
+    # seq: ultimo intento applicato; error: ultima risposta negativa per il browser.
+    return {"wheel": target, "seq": 0, "error": None}
+
+
+def apply_intents(session: Dict, events: List[Dict], perf: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Applica gli intenti del browser non ancora visti (per ``seq``) alla partita della ruota.
+
+    Gli OK portano l'id della decisione a cui rispondono. Uno SPIN o un OK rifiutati
+    lasciano ``session["error"]`` con il loro ``seq``. I lotti di telemetria (``perf``)
+    non toccano la partita: vanno a ``perf`` se c'è.
+    """
+    target = session["wheel"]
+    with target.lock:
+        engine, journal, game = target.engine, target.journal, target.game
+        for ev in events:
+            if ev["seq"] <= session["seq"]:
+                continue
+            session["seq"] = ev["seq"]
+            if ev["t"] == "spin":
+                if engine.state.pending >= 0 or engine.finished():
+                    # Un altro schermo ha girato per primo, o la partita è finita: la risposta
+                    # negativa sblocca il browser che aspettava la sua decisione.
+                    msg = "Partita finita." if engine.finished() else "Giro già in corso."
+                    session["error"] = {"id": ev["seq"], "msg": msg}
+                    continue
+                outcome = engine.spin()
+                if journal:
+                    journal.append(game, engine, SPIN, str(outcome.start))
+                # Id in millisecondi (almeno +1): crescono anche fra un riavvio del server e
+                # l'altro, quando il contatore riparte ma i kiosk aperti ricordano l'ultimo visto.
+                target.decisions = max(target.decisions + 1, int(time.time() * 1000))
+                decision = outcome._asdict()
+                decision["id"] = target.decisions
+                target.decision = decision
+            elif ev["t"] == "ok":
+                # L'OK vale per la decisione che quel browser ha messo in scena: uno in ritardo
+                # da un altro schermo non chiude l'overlay di una decisione più nuova.
+                if target.decision is not None and ev.get("decision") != target.decision["id"]:
+                    session["error"] = {"id": ev["seq"], "msg": "Overlay già chiuso da un altro schermo."}
+                    continue
+                try:
+                    pending = engine.state.pending
+                    engine.confirm(ev.get("pack"))
+                    if journal and pending >= 0:
+                        journal.append(game, engine, OK, ev.get("pack"))
+                    session["error"] = None
+                except ValueError as exc:
+                    session["error"] = {"id": ev["seq"], "msg": str(exc)}
+            elif ev["t"] == "perf" and perf:
+                perf(ev)
+    return session
+
+
+def _session_id() -> str:
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else ""
+
+
+def shed_idle_sessions(hosting: Host, close_idle: bool = False) -> List[str]:
+    """Dimentica le sessioni disconnesse e libera le ruote senza spettatori.
+
+    ``close_idle`` (solo dal tasto dell'operatore) chiude anche le sessioni connesse
+    ma inattive: ``Runtime.close_session`` va chiamato sul thread dell'event loop,
+    quindi la chiusura è schedulata lì.
+    """
+    if not Runtime.exists():
+        return hosting.shed()
+    runtime = Runtime.instance()
+    close = None
+    if close_idle:
+        loop = runtime._get_async_objs().eventloop
+        close = partial(loop.call_soon_threadsafe, runtime.close_session)
+    return hosting.shed(is_active=runtime.is_active_session, close=close)
+
+
+def mount_token(target: Wheel, assets: Dict) -> str:
+    """Identifica ciò che il browser monta una volta: layout della ruota + tabella asset."""
+    global _assets_key
+    cached = _assets_key
+    if cached[0] is not assets:
+        blob = json.dumps(assets, sort_keys=True, separators=(",", ":")).encode()
+        cached = _assets_key = (assets, hashlib.sha256(blob).hexdigest()[:12])
+    return f"{target.game}:{cached[1]}"
+
+
+def render_args(session: Dict, assets: Dict, mounted: Optional[str], timing: str = DEFAULT_PROFILE) -> Dict:
+    """Argomenti del componente: layout, asset e opzioni solo finché il browser non ha montato.
+
+    Dopo il primo mount (confermato con ``mounted`` nel valore del componente) a
+    ogni rerun viaggiano solo vista, decisione, errore e ack.
+    """
+    target = session["wheel"]
+    token = mount_token(target, assets)
+    with target.lock:
+        args = dict(
+            view=target.engine.view(),
+            decision=target.decision,
+            error=session["error"],
+            ack=session["seq"],
+            mount=token,
+        )
+    if mounted != token:
+        args.update(
+            assets=assets,
+            layout=target.payload,
+            options={"renderer": RENDERER, "audio": AUDIO, "power": POWER,
+                     "idle_seconds": IDLE_SECONDS, "measure": MEASURE_SECONDS, "offline": OFFLINE,
+                     "telemetry": TELEMETRY_SECONDS, "timing": profile(timing)},
+        )
+    return args
+
+
+def wheel(assets: Dict, target: Wheel, key: str = "ruota", timing: str = DEFAULT_PROFILE) -> Dict:
+    """Monta la ruota: il bundle si carica una volta, poi viaggiano solo intenti e stato.
+
+    Il browser invia intenti (spin, ok); Python decide con ``Engine`` e
+    restituisce la vista compatta più l'ultima decisione da animare, con i tempi
+    del profilo ``timing`` (ruota/timing.py).
+    """
+    session_key = f"{key}:session"
+    session = st.session_state.get(session_key)
+    if session is None or session["wheel"] is not target:
+        session = st.session_state[session_key] = new_session(target)
+
+    hosting = host()
+    value = st.session_state.get(key)
+    if value:
+        session_id = _session_id()
+        # Telemetria spenta: i lotti (di un client qualsiasi) si scartano senza aggregarli.
+        perf = (lambda batch: hosting.telemetry.add(session_id, batch)) if TELEMETRY_SECONDS else None
+        apply_intents(session, value.get("events", []), perf=perf)
+
+    args = render_args(session, assets, value.get("mounted") if value else None, timing)
+    _component(**args, key=key, default=None)
+
+    hosting.touch(_session_id(), target.name, args, st.session_state.to_dict())
+    if hosting.shed_due():
+        shed_idle_sessions(hosting)
+    return session
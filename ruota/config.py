@@ -0,0 +1,169 @@
+"""File di configurazione delle ruote (``RUOTA_WHEELS``), validato prima di servire.
+
+Un oggetto JSON ``{"nome": {...}}``; per ogni ruota, tutto facoltativo::
+
+    {
+      "players": 40 | ["Anna", ...] | "giocatori.txt",
+      "prizes": 10 | ["1", ...] | "premi.txt",
+      "malus": ["MALUS_1", {"effect": "MALUS_2", "label": "SCEGLI", "img": "malus2"}, ...],
+      "positions": [0, 3, 7, 10] | "spread",
+      "colors": {"prize": ["#B51E1E", "#F4E2C6"], "malus": "#D8A83A", "burned": "#7A7A7A"},
+      "sizes": {"label_radius": 0.6, "font_min": 12, "font_vw": 1.6, "font_max": 22, "max_slices": 48}
+    }
+
+Gli effetti dei malus sono quelli di ``Engine`` (MALUS_1..MALUS_4, anche ripetuti);
+i file di nomi sono relativi al file di configurazione. Ogni errore è un
+``ValueError`` con il nome della ruota e il campo.
+"""
+import json
+import os
+import re
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from ruota.engine import DEFAULT_MALUS, Layout, load_names, spread_positions
+from ruota.geometry import DEFAULT_STYLE, Style
+
+WHEEL_KEYS = {"players", "prizes", "malus", "positions", "colors", "sizes"}
+COLOR_KEYS = {"prize", "malus", "burned"}
+SIZE_LIMITS = {
+    "label_radius": (0.1, 0.95),
+    "font_min": (4, 200),
+    "font_vw": (0.1, 20),
+    "font_max": (4, 200),
+    "max_slices": (2, 360),
+}
+_COLOR = re.compile(r"^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+_IMAGE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def load_config(path: str) -> Dict[str, Layout]:
+    with open(path, encoding="utf-8") as f:
+        try:
+            specs = json.load(f)
+        except ValueError as exc:
+            raise ValueError(f"{path}: JSON non valido ({exc})") from None
+    if not isinstance(specs, dict) or not specs:
+        raise ValueError(f"{path}: serve un oggetto {{\"nome\": {{...}}}} con almeno una ruota")
+    base = os.path.dirname(os.path.abspath(path))
+    return {str(name): parse_wheel(str(name), spec, base) for name, spec in specs.items()}
+
+
+def parse_wheel(name: str, spec: Dict, base: str = ".") -> Layout:
+    def fail(field: str, msg: str) -> ValueError:
+        return ValueError(f"ruota '{name}', {field}: {msg}")
+
+    if not isinstance(spec, dict):
+        raise fail("configurazione", "serve un oggetto")
+    unknown = set(spec) - WHEEL_KEYS
+    if unknown:
+        raise fail(", ".join(sorted(unknown)), f"campo sconosciuto (ammessi: {', '.join(sorted(WHEEL_KEYS))})")
+
+    players = _names(spec.get("players"), "Player {}", base, lambda m: fail("players", m))
+    prizes = _names(spec.get("prizes"), "{}", base, lambda m: fail("prizes", m))
+    if len(set(prizes)) != len(prizes):
+        raise fail("prizes", "etichette ripetute (il numero del pacco deve essere univoco)")
+    if len(players) < len(prizes):
+        raise fail("players", f"{len(players)} giocatori per {len(prizes)} premi: ne servono almeno tanti quanti i premi")
+
+    effects, labels, images = _malus(spec.get("malus"), lambda m: fail("malus", m))
+    n_segs = len(prizes) + len(effects)
+    positions = spec.get("positions", "spread")
+    if positions == "spread":
+        positions = spread_positions(n_segs, len(effects))
+    elif not (isinstance(positions, list) and all(isinstance(p, int) for p in positions)):
+        raise fail("positions", "serve una lista di interi o \"spread\"")
+    elif len(positions) != len(effects) or len(set(positions)) != len(positions):
+        raise fail("positions", f"servono {len(effects)} posizioni diverse, una per malus")
+    elif not all(0 <= p < n_segs for p in positions):
+        raise fail("positions", f"fuori dalla ruota (0-{n_segs - 1})")
+
+    style = _style(spec.get("colors"), spec.get("sizes"), fail)
+    return Layout(
+        players, prizes,
+        malus=effects,
+        malus_positions=tuple(positions),
+        malus_labels=labels,
+        malus_images=images,
+        style=style,
+    )
+
+
+def _names(value, template: str, base: str, fail) -> Tuple[str, ...]:
+    if isinstance(value, list):
+        names = tuple(str(v).strip() for v in value)
+        if not names or not all(names):
+            raise fail("lista vuota o con nomi vuoti")
+        return names
+    if isinstance(value, bool) or (value is not None and not isinstance(value, (int, str))):
+        raise fail("serve un numero, una lista di nomi o un file")
+    if isinstance(value, int):
+        if value < 1:
+            raise fail("serve almeno 1")
+        return load_names(str(value), template)
+    if value and value.isdigit():
+        return load_names(value, template)
+    try:
+        return load_names(os.path.join(base, value) if value else None, template)
+    except OSError as exc:
+        raise fail(f"file non leggibile ({exc.strerror}: {value})") from None
+    except ValueError as exc:
+        raise fail(str(exc)) from None
+
+
+def _malus(value, fail) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    if value is None:
+        return DEFAULT_MALUS, (), ()
+    if not isinstance(value, list):
+        raise fail("serve una lista di effetti o di oggetti {effect, label, img}")
+    effects: List[str] = []
+    labels: List[str] = []
+    images: List[str] = []
+    for k, item in enumerate(value):
+        item = {"effect": item} if isinstance(item, str) else item
+        if not isinstance(item, dict) or set(item) - {"effect", "label", "img"}:
+            raise fail(f"voce {k + 1}: ammessi solo effect, label, img")
+        effect = item.get("effect")
+        if effect not in DEFAULT_MALUS:
+            raise fail(f"voce {k + 1}: effetto {effect!r} sconosciuto (ammessi: {', '.join(DEFAULT_MALUS)})")
+        img = str(item.get("img", f"malus{DEFAULT_MALUS.index(effect) + 1}"))
+        if not _IMAGE_ID.match(img):
+            raise fail(f"voce {k + 1}: img deve essere l'id di un asset")
+        effects.append(effect)
+        labels.append(str(item.get("label", "IMPREVISTO")).strip() or "IMPREVISTO")
+        images.append(img)
+    return tuple(effects), tuple(labels), tuple(images)
+
+
+def _style(colors: Optional[Dict], sizes: Optional[Dict], fail) -> Style:
+    changes: Dict = {}
+    if colors is not None:
+        if not isinstance(colors, dict) or set(colors) - COLOR_KEYS:
+            raise fail("colors", f"ammessi solo {', '.join(sorted(COLOR_KEYS))}")
+        prize = colors.get("prize")
+        if prize is not None:
+            if not (isinstance(prize, list) and len(prize) == 2):
+                raise fail("colors.prize", "servono due colori (fette alterne)")
+            changes["prize_colors"] = tuple(_color(c, "colors.prize", fail) for c in prize)
+        if "malus" in colors:
+            changes["malus_color"] = _color(colors["malus"], "colors.malus", fail)
+        if "burned" in colors:
+            changes["burned_color"] = _color(colors["burned"], "colors.burned", fail)
+    if sizes is not None:
+        if not isinstance(sizes, dict) or set(sizes) - set(SIZE_LIMITS):
+            raise fail("sizes", f"ammessi solo {', '.join(SIZE_LIMITS)}")
+        for key, value in sizes.items():
+            lo, hi = SIZE_LIMITS[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not lo <= value <= hi:
+                raise fail(f"sizes.{key}", f"serve un numero fra {lo} e {hi}")
+            changes[key] = int(value) if key == "max_slices" else float(value)
+    style = replace(DEFAULT_STYLE, **changes)
+    if style.font_min > style.font_max:
+        raise fail("sizes", "font_min maggiore di font_max")
+    return style
+
+
+def _color(value, field: str, fail) -> str:
+    if not isinstance(value, str) or not _COLOR.match(value):
+        raise fail(field, f"{value!r} non è un colore esadecimale (#RGB, #RRGGBB)")
+    return value
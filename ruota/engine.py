@@ -0,0 +1,441 @@
+"""Motore di gioco headless: le stesse regole della ruota, senza browser.
+
+Lo stato è compatto e a slot: i segmenti bruciati sono un bitset (``int``),
+l'ordine dei turni è un array di indici giocatore con il suo inverso
+(``pos``), le assegnazioni sono indici premio per giocatore (-1 = nessuno).
+I segmenti ancora vivi stanno anche in un array con indice inverso
+(``live``/``slot``): estrazione e rimozione in O(1). L'ordine dei turni è un
+``TurnOrder`` (Fenwick): scambio O(1), posizione e spostamento in fondo O(log n),
+così anche feste con migliaia di giocatori restano istantanee.
+Il frontend riceve solo le decisioni (``Outcome``) e le anima.
+"""
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ruota.rng import SeededRandom
+
+MALUS_1 = "MALUS_1"  # scambio con il giocatore successivo + salto
+MALUS_2 = "MALUS_2"  # il giocatore sceglie un pacco a mano
+MALUS_3 = "MALUS_3"  # il giocatore va in fondo alla fila
+MALUS_4 = "MALUS_4"  # il giocatore rigioca
+
+DEFAULT_MALUS = (MALUS_1, MALUS_2, MALUS_3, MALUS_4)
+DEFAULT_MALUS_POSITIONS = (0, 3, 7, 10)
+
+EXTRA_SPINS = 8
+BASE_ROT = -90
+
+# Scelta del segmento: "direct" estrae subito fra quelli vivi (un solo giro, durata
+# costante); "nudge" è il comportamento storico (segmento a caso, poi avanti di uno
+# alla volta finché non se ne trova uno libero).
+SELECTION_MODES = ("direct", "nudge")
+DEFAULT_SELECTION = os.environ.get("RUOTA_SELECTION", "direct")
+
+# Valori di Outcome.kind / GameState.pending
+NONE, GIFT, MALUS, SKIP = 0, 1, 2, 3
+
+
+@dataclass(frozen=True)
+class Layout:
+    players: Tuple[str, ...]
+    prizes: Tuple[str, ...]
+    malus: Tuple[str, ...] = DEFAULT_MALUS
+    malus_positions: Tuple[int, ...] = DEFAULT_MALUS_POSITIONS
+    # Come si presentano i malus (vuoti: "IMPREVISTO" e immagine malus<k>); l'effetto è in ``malus``.
+    malus_labels: Tuple[str, ...] = ()
+    malus_images: Tuple[str, ...] = ()
+    # Colori e misure della ruota (ruota/geometry.py ``Style``); None = quelli storici.
+    style: Any = field(default=None, compare=False, repr=False)
+    # Derivati: per ogni segmento l'indice del premio (>= 0) o ~indice del malus (< 0).
+    seg_ref: Tuple[int, ...] = field(init=False)
+    prize_seg: Tuple[int, ...] = field(init=False)
+    prize_by_label: Dict[str, int] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if len(self.players) < len(self.prizes):
+            # Serviti tutti, restano premi: ogni giro sarebbe un salto e la partita non finirebbe.
+            raise ValueError(f"servono almeno tanti giocatori quanti premi "
+                             f"({len(self.players)} giocatori, {len(self.prizes)} premi)")
+        n = len(self.prizes) + len(self.malus)
+        positions = set(self.malus_positions)
+        if len(positions) != len(self.malus) or not all(0 <= p < n for p in positions):
+            raise ValueError("malus_positions non compatibile con il numero di segmenti")
+        for extra in (self.malus_labels, self.malus_images):
+            if extra and len(extra) != len(self.malus):
+                raise ValueError("malus_labels/malus_images: uno per malus")
+        seg_ref, prize_seg = [], []
+        prize_idx = malus_idx = 0
+        for i in range(n):
+            if i in positions:
+                seg_ref.append(~malus_idx)
+                malus_idx += 1
+            else:
+                seg_ref.append(prize_idx)
+                prize_seg.append(i)
+                prize_idx += 1
+        object.__setattr__(self, "seg_ref", tuple(seg_ref))
+        object.__setattr__(self, "prize_seg", tuple(prize_seg))
+        object.__setattr__(self, "prize_by_label", {label: i for i, label in enumerate(self.prizes)})
+
+    @property
+    def n_segs(self) -> int:
+        return len(self.seg_ref)
+
+    def seg_id(self, i: int) -> str:
+        ref = self.seg_ref[i]
+        return f"PRIZE_{self.prizes[ref]}" if ref >= 0 else self.malus[~ref]
+
+    def segments(self) -> List[Dict[str, str]]:
+        """Descrizione dei segmenti per il renderer."""
+        segs = []
+        for i, ref in enumerate(self.seg_ref):
+            if ref >= 0:
+                segs.append({"id": self.seg_id(i), "label": self.prizes[ref], "kind": "prize"})
+            else:
+                k = ~ref
+                segs.append({"id": self.malus[k],
+                             "label": self.malus_labels[k] if self.malus_labels else "IMPREVISTO",
+                             "kind": "malus",
+                             "img": self.malus_images[k] if self.malus_images else f"malus{k + 1}"})
+        return segs
+
+    def to_dict(self) -> Dict:
+        return {"players": list(self.players), "segs": self.segments()}
+
+
+def spread_positions(n_segs: int, n_malus: int = len(DEFAULT_MALUS)) -> Tuple[int, ...]:
+    """Malus distribuiti a distanza uniforme sulla ruota (14 segmenti: posizioni storiche)."""
+    if (n_segs, n_malus) == (10 + len(DEFAULT_MALUS), len(DEFAULT_MALUS)):
+        return DEFAULT_MALUS_POSITIONS
+    return tuple(k * n_segs // n_malus for k in range(n_malus))
+
+
+def make_layout(players: Sequence[str], prizes: Sequence[str]) -> Layout:
+    players, prizes = tuple(players), tuple(prizes)
+    return Layout(players, prizes, malus_positions=spread_positions(len(prizes) + len(DEFAULT_MALUS)))
+
+
+def default_layout(n_players: int = 10, n_prizes: int = 10) -> Layout:
+    return make_layout(
+        players=[f"Player {i + 1}" for i in range(n_players)],
+        prizes=[str(i + 1) for i in range(n_prizes)],
+    )
+
+
+def load_names(spec: Optional[str], template: str, default: int = 10) -> Tuple[str, ...]:
+    """Nomi da un file (uno per riga) o da un numero (``template.format(i)``, da 1)."""
+    if spec and not spec.isdigit():
+        with open(spec, encoding="utf-8") as f:
+            names = tuple(line.strip() for line in f if line.strip())
+        if not names:
+            raise ValueError(f"{spec}: nessun nome")
+        return names
+    return tuple(template.format(i + 1) for i in range(int(spec) if spec else default))
+
+
+def rotation_for_index(index: int, n_segs: int) -> float:
+    center = (index + 0.5) * (360 / n_segs)
+    return (360 + (0 - (BASE_ROT + center))) % 360
+
+
+class Outcome(NamedTuple):
+    kind: int                 # NONE / GIFT / MALUS / SKIP
+    player: int               # chi ha girato
+    start: int                # segmento su cui si ferma il giro lungo
+    steps: Tuple[int, ...]    # segmenti attraversati dal nudge (l'ultimo è il finale)
+    final: int                # segmento assegnato (-1 se nessuno)
+    rot: float                # rotazione finale della ruota
+
+
+class TurnOrder:
+    """Ordine dei turni su slot: ogni giocatore occupa uno slot, la posizione è il
+    numero di slot occupati prima del suo (albero di Fenwick).
+
+    Scambiare due giocatori scambia solo i loro slot (O(1)); mandarne uno in fondo
+    libera il suo slot e ne occupa uno nuovo in coda (O(log n)). La capacità è
+    ``n + moves``: i malus che spostano in fondo sono al più uno per segmento.
+    """
+    __slots__ = ("n", "slot_of", "player_at", "tree", "tail")
+
+    def __init__(self, order: Sequence[int], moves: int = 0):
+        self.n = len(order)
+        cap = self.n + moves
+        self.slot_of = [0] * self.n
+        self.player_at = [-1] * cap
+        self.tree = [0] * (cap + 1)
+        for i, p in enumerate(order):
+            self.slot_of[p] = i
+            self.player_at[i] = p
+        # Costruzione in O(n): ogni nodo propaga la sua somma al genitore.
+        for i in range(1, cap + 1):
+            self.tree[i] += 1 if i <= self.n else 0
+            parent = i + (i & -i)
+            if parent <= cap:
+                self.tree[parent] += self.tree[i]
+        self.tail = self.n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _add(self, slot: int, delta: int) -> None:
+        i = slot + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def pos(self, player: int) -> int:
+        """Posizione del giocatore nella fila (0 = primo)."""
+        i, total = self.slot_of[player], 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def at(self, pos: int) -> int:
+        """Giocatore in posizione ``pos``: discesa sull'albero, O(log n)."""
+        i, step = 0, 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = i + step
+            if nxt < len(self.tree) and self.tree[nxt] <= pos:
+                i = nxt
+                pos -= self.tree[nxt]
+            step >>= 1
+        return self.player_at[i]
+
+    def swap(self, i: int, j: int) -> None:
+        a, b = self.at(i), self.at(j)
+        sa, sb = self.slot_of[a], self.slot_of[b]
+        self.slot_of[a], self.slot_of[b] = sb, sa
+        self.player_at[sa], self.player_at[sb] = b, a
+
+    def move_to_end(self, player: int) -> None:
+        if self.tail == len(self.player_at):
+            self._compact()
+        old = self.slot_of[player]
+        self.player_at[old] = -1
+        self._add(old, -1)
+        self.slot_of[player] = self.tail
+        self.player_at[self.tail] = player
+        self._add(self.tail, 1)
+        self.tail += 1
+
+    def _compact(self) -> None:
+        # Capacità esaurita (più spostamenti del previsto): si riparte raddoppiando.
+        fresh = TurnOrder(self.to_list(), moves=max(self.n, 1))
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+    def to_list(self) -> List[int]:
+        return [p for p in self.player_at[:self.tail] if p >= 0]
+
+
+class GameState:
+    __slots__ = ("burned", "live", "slot", "order", "turn", "assigned", "last", "pending", "rot")
+
+    def __init__(self, n_players: int, n_segs: int, order: Optional[Sequence[int]] = None):
+        self.burned = 0
+        self.live = list(range(n_segs))
+        self.slot = list(range(n_segs))  # posizione in live, -1 se bruciato
+        self.order = TurnOrder(range(n_players) if order is None else order, moves=n_segs)
+        self.turn = 0
+        self.assigned = [-1] * n_players
+        self.last = -1
+        self.pending = -1          # segmento in attesa di conferma (overlay aperto)
+        self.rot = 0.0
+
+    def burn(self, seg: int) -> None:
+        """Rimozione O(1) da live: l'ultimo elemento prende il posto di quello bruciato."""
+        i = self.slot[seg]
+        if i < 0:
+            return
+        tail = self.live.pop()
+        if tail != seg:
+            self.live[i] = tail
+            self.slot[tail] = i
+        self.slot[seg] = -1
+        self.burned |= 1 << seg
+
+    def to_dict(self) -> Dict:
+        # live fa parte dello stato: il suo ordine decide quale segmento esce a parità di seed.
+        return {"b": self.burned, "v": self.live, "o": self.order.to_list(), "t": self.turn,
+                "a": self.assigned, "l": self.last, "p": self.pending, "r": self.rot}
+
+    @classmethod
+    def from_dict(cls, data: Dict, n_segs: int) -> "GameState":
+        state = cls(len(data["o"]), n_segs, order=data["o"])
+        state.burned = data["b"]
+        state.live = list(data["v"])
+        state.slot = [-1] * n_segs
+        for i, seg in enumerate(state.live):
+            state.slot[seg] = i
+        state.turn = data["t"]
+        state.assigned = list(data["a"])
+        state.last = data["l"]
+        state.pending = data["p"]
+        state.rot = data["r"]
+        return state
+
+
+class Engine:
+    """Transizioni di gioco identiche a quelle storiche del frontend JS."""
+
+    def __init__(self, layout: Layout, state: Optional[GameState] = None,
+                 rng: Union[SeededRandom, random.Random, None] = None, selection: str = DEFAULT_SELECTION):
+        if selection not in SELECTION_MODES:
+            raise ValueError(f"selection deve essere uno fra {SELECTION_MODES}")
+        self.layout = layout
+        self.state = state or GameState(len(layout.players), layout.n_segs)
+        # Seminato di default: seme + pacchi di MALUS_2 rigiocano la partita (ruota/replay.py).
+        self.rng = rng or SeededRandom()
+        self.selection = selection
+        # Contatore dei premi ancora in gioco, aggiornato a ogni segmento bruciato.
+        burned = self.state.burned
+        self._left = sum(1 for seg in layout.prize_seg if not (burned >> seg) & 1)
+
+    # --- query ---
+    def is_burned(self, seg: int) -> bool:
+        return (self.state.burned >> seg) & 1 == 1
+
+    def current_player(self) -> int:
+        return self.state.order.at(self.state.turn)
+
+    def remaining_prizes(self) -> int:
+        return self._left
+
+    def finished(self) -> bool:
+        return self.remaining_prizes() == 0
+
+    # --- turni ---
+    def _burn(self, seg: int) -> None:
+        if not self.is_burned(seg) and self.layout.seg_ref[seg] >= 0:
+            self._left -= 1
+        self.state.burn(seg)
+
+    def _advance_from(self, player: int) -> None:
+        s = self.state
+        base = s.order.pos(player) if player >= 0 else s.turn
+        s.turn = (base + 1) % len(s.order)
+
+    # --- transizioni ---
+    def spin(self, start: Optional[int] = None) -> Outcome:
+        s, layout = self.state, self.layout
+        if s.pending >= 0:
+            raise RuntimeError("overlay ancora aperto: serve confirm()")
+        n = layout.n_segs
+        player = s.order.at(s.turn)
+        s.last = player
+
+        if s.assigned[player] >= 0:
+            self._advance_from(player)
+            return Outcome(SKIP, player, -1, (), -1, s.rot)
+
+        if start is None:
+            if self.selection == "direct":
+                # Solo segmenti vivi: nessun nudge, il giro finisce già sul risultato.
+                start = s.live[self.rng.randrange(len(s.live))] if s.live else 0
+            else:
+                start = self.rng.randrange(n)
+        current_mod = s.rot % 360
+        delta = (360 + rotation_for_index(start, n) - current_mod) % 360
+        rot = s.rot + EXTRA_SPINS * 360 + delta
+
+        # Nudge in senso orario fino al primo segmento non bruciato.
+        idx, steps, burned = start, [], s.burned
+        while (burned >> idx) & 1:
+            idx = (idx + 1) % n
+            steps.append(idx)
+            rot = math.trunc(rot / 360) * 360 + rotation_for_index(idx, n)
+            if len(steps) > n + 2:
+                break
+        s.rot = rot
+
+        if (burned >> idx) & 1:
+            return Outcome(NONE, player, start, tuple(steps), -1, rot)
+
+        self._burn(idx)
+        s.pending = idx
+        ref = layout.seg_ref[idx]
+        if ref >= 0:
+            s.assigned[player] = ref
+            return Outcome(GIFT, player, start, tuple(steps), idx, rot)
+
+        malus = layout.malus[~ref]
+        if malus == MALUS_1:
+            curr = s.turn
+            s.order.swap(curr, (curr + 1) % len(s.order))
+            s.last = s.order.at((curr - 1) % len(s.order))
+        elif malus == MALUS_3:
+            s.order.move_to_end(player)
+            s.turn = len(s.order) - 1
+        return Outcome(MALUS, player, start, tuple(steps), idx, rot)
+
+    def confirm(self, pack: Optional[str] = None) -> None:
+        """Chiusura dell'overlay (tasto OK). Per MALUS_2 serve il numero del pacco."""
+        s, layout = self.state, self.layout
+        seg = s.pending
+        if seg < 0:
+            return
+        ref = layout.seg_ref[seg]
+        malus = layout.malus[~ref] if ref < 0 else None
+
+        if malus == MALUS_2:
+            prize = self.pack_index(pack)
+            s.assigned[s.last] = prize
+            self._burn(layout.prize_seg[prize])
+
+        s.pending = -1
+        if malus != MALUS_4:
+            self._advance_from(s.last)
+
+    def pack_index(self, pack: Optional[str]) -> int:
+        n_prizes = len(self.layout.prizes)
+        try:
+            n = int(str(pack).strip())
+        except ValueError:
+            n = 0
+        if not 1 <= n <= n_prizes:
+            raise ValueError(f"Inserisci un numero pacco valido (1-{n_prizes}).")
+        # Il numero del pacco è l'etichetta del premio se esiste, altrimenti la sua posizione.
+        label = str(n)
+        prize = self.layout.prize_by_label.get(label, n - 1)
+        if self.is_burned(self.layout.prize_seg[prize]):
+            raise ValueError("Pacco già assegnato.")
+        return prize
+
+    # --- vista per il renderer ---
+    def view(self) -> Dict:
+        s, layout = self.state, self.layout
+        return {
+            "burned": [i for i, slot in enumerate(s.slot) if slot < 0],
+            "order": s.order.to_list(),
+            "turn": s.turn,
+            "assigned": [layout.prizes[a] if a >= 0 else "" for a in s.assigned],
+            "pending": s.pending,
+            "rot": s.rot,
+            "remaining": self.remaining_prizes(),
+        }
+
+
+def play(engine: Engine, packs: Sequence[str] = (), max_spins: int = 10_000) -> int:
+    """Gioca una partita intera senza animazioni; ritorna il numero di spin."""
+    packs = list(packs)
+    spins = 0
+    while not engine.finished() and spins < max_spins:
+        outcome = engine.spin()
+        spins += 1
+        if engine.state.pending >= 0:
+            pack = None
+            if outcome.kind == MALUS and engine.layout.seg_id(outcome.final) == MALUS_2:
+                pack = packs.pop(0) if packs else _first_free_pack(engine)
+            engine.confirm(pack)
+    return spins
+
+
+def _first_free_pack(engine: Engine) -> str:
+    for prize, seg in enumerate(engine.layout.prize_seg):
+        if not engine.is_burned(seg):
+            return engine.layout.prizes[prize]
+    return engine.layout.prizes[0]
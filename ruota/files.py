@@ -0,0 +1,58 @@
+"""Utility di file condivise da asset, bundle e pipeline offline."""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Tuple
+
+_lock = threading.Lock()
+_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_json: Dict[str, Tuple[int, Dict]] = {}
+
+
+def digest(path: str) -> str:
+    """sha256 del contenuto, ricalcolato solo se cambiano mtime o dimensione."""
+    path = os.path.abspath(path)
+    info = os.stat(path)
+    key = (info.st_mtime_ns, info.st_size)
+    with _lock:
+        cached = _digests.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    value = h.hexdigest()
+    with _lock:
+        _digests[path] = (key, value)
+    return value
+
+
+def load_json(path: str) -> Dict:
+    """JSON letto da disco e tenuto in memoria finché non cambia; {} se manca o non è valido."""
+    path = os.path.abspath(path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    with _lock:
+        cached = _json.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    with _lock:
+        _json[path] = (mtime, data)
+    return data
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Scrive su un temporaneo e lo rinomina: chi legge vede il file vecchio o quello nuovo."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
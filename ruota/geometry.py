@@ -0,0 +1,100 @@
+"""Geometria della ruota calcolata in Python, una volta per configurazione.
+
+Fette (anche raggruppate, oltre ``max_slices`` segmenti), stop del conic-gradient,
+trasformazioni delle etichette e rotazione di arrivo per ogni segmento arrivano al
+browser come tabelle pronte: il frontend non ricalcola angoli né al boot né ai
+render. Il raggio delle etichette è una frazione del raggio della ruota (unità
+``cqmin`` del contenitore ``.labels``), quindi regge qualunque ridimensionamento.
+Le tabelle stanno in cache per hash della configurazione (layout + stile).
+"""
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Tuple
+
+from ruota.engine import BASE_ROT, Layout, rotation_for_index
+
+
+@dataclass(frozen=True)
+class Style:
+    prize_colors: Tuple[str, str] = ("#B51E1E", "#F4E2C6")  # fette alterne
+    malus_color: str = "#D8A83A"
+    burned_color: str = "#7A7A7A"
+    label_radius: float = 0.6  # frazione del raggio della ruota
+    font_min: float = 12       # px; font delle etichette: clamp(min, vw, max)
+    font_vw: float = 1.6
+    font_max: float = 22
+    max_slices: int = 48
+
+
+DEFAULT_STYLE = Style()
+
+_lock = threading.Lock()
+_cache: Dict[str, Dict] = {}
+
+
+def config_hash(layout: Layout) -> str:
+    style = layout.style or DEFAULT_STYLE
+    blob = json.dumps({"layout": layout.to_dict(), "style": asdict(style)}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:12]
+
+
+def geometry(layout: Layout) -> Dict:
+    """Tabelle per il renderer, condivise da tutte le ruote con la stessa configurazione."""
+    key = config_hash(layout)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is None:
+        cached = _build(layout, layout.style or DEFAULT_STYLE, key)
+        with _lock:
+            cached = _cache.setdefault(key, cached)
+    return cached
+
+
+def _num(x: float) -> str:
+    return f"{x:.4f}".rstrip("0").rstrip(".")
+
+
+def _build(layout: Layout, style: Style, key: str) -> Dict:
+    segs = layout.segments()
+    n = len(segs)
+    unit = 360 / n
+    g = min(n, style.max_slices)
+    slices = []
+    label_r = _num(style.label_radius * 50)  # 50cqmin = raggio
+    for k in range(g):
+        a, b = k * n // g, (k + 1) * n // g
+        prizes, malus = [], 0
+        for i in range(a, b):
+            if segs[i]["kind"] == "malus":
+                malus += 1
+            else:
+                prizes.append(segs[i]["label"])
+        if b - a == 1:
+            label = segs[a]["label"] if malus else f"PREMIO {segs[a]['label']}"
+        else:
+            label = (f"PREMI {prizes[0]}–{prizes[-1]}" if len(prizes) > 1
+                     else f"PREMIO {prizes[0]}" if prizes else "IMPREVISTI")
+        mid = (a + b) / 2 * unit + BASE_ROT
+        slices.append({
+            "from": a,
+            "to": b,
+            "label": label,
+            "malus": malus,
+            "color": style.prize_colors[k % 2],
+            "span": f"{_num(a * unit)}deg {_num(b * unit)}deg",
+            "transform": f"translate(-50%, -50%) rotate({_num(mid)}deg) translateY(-{label_r}cqmin) rotate(90deg)",
+        })
+    return {
+        "hash": key,
+        "slices": slices,
+        # Rotazione di arrivo per segmento (come Engine.spin; la vista porta poi quella esatta).
+        "rot": [round(rotation_for_index(i, n), 4) for i in range(n)],
+        "colors": {"malus": style.malus_color, "burned": style.burned_color},
+        "label": {
+            "radius": style.label_radius,
+            "font": [style.font_min, style.font_vw, style.font_max],
+            "css_font": f"clamp({_num(style.font_min)}px, {_num(style.font_vw)}vw, {_num(style.font_max)}px)",
+        },
+    }
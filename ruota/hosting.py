@@ -0,0 +1,211 @@
+"""Più ruote con nome servite da un solo processo Streamlit (sale, squadre).
+
+Ogni ``Wheel`` ha il suo layout e la sua partita, condivisa da tutte le sessioni
+che la guardano (``?wheel=<nome>``); layout serializzato, asset e bundle del
+frontend sono immutabili e calcolati una volta per processo. Per sessione restano
+solo il numero di sequenza degli intenti e l'ultimo errore.
+
+``Host`` tiene il conto delle sessioni (memoria stimata, dimensione dei payload,
+ultima attività) per dimensionare la macchina e liberare quelle inattive, più la
+telemetria del frontend (ruota/telemetry.py).
+"""
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ruota.config import load_config
+from ruota.engine import Engine, Layout, load_names, make_layout
+from ruota.geometry import geometry
+from ruota.journal import Journal, game_id
+from ruota.telemetry import Telemetry
+
+# File JSON {"nome": {"players": 40 | "file.txt", "prizes": ..., ...}} (vedi ruota/config.py);
+# senza, una sola ruota.
+WHEELS_PATH = os.environ.get("RUOTA_WHEELS", "")
+DEFAULT_WHEEL = "ruota"
+# Inattività oltre la quale il tasto dell'operatore chiude una sessione ancora connessa.
+IDLE_SESSION_SECONDS = float(os.environ.get("RUOTA_IDLE_SESSION_MINUTES", "30")) * 60
+
+
+def load_wheels(path: str = WHEELS_PATH) -> Dict[str, Layout]:
+    if not path:
+        return {DEFAULT_WHEEL: make_layout(
+            players=load_names(os.environ.get("RUOTA_PLAYERS"), "Player {}"),
+            prizes=load_names(os.environ.get("RUOTA_PRIZES"), "{}"),
+        )}
+    return load_config(path)
+
+
+class Wheel:
+    """Una ruota con nome: layout immutabile più la partita in corso."""
+
+    def __init__(self, name: str, layout: Layout, journal: Optional[Journal] = None):
+        self.name = name
+        self.layout = layout
+        # Serializzato una volta, con la geometria pronta: ogni sessione spedisce lo stesso dict.
+        self.payload = dict(layout.to_dict(), geometry=geometry(layout))
+        self.payload_bytes = _json_size(self.payload)
+        self.journal = journal
+        self.game = game_id(name, layout)
+        self.lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self.decision: Optional[Dict] = None
+        self.decisions = 0  # id dell'ultima decisione, crescente anche fra un riavvio e l'altro
+
+    @property
+    def engine(self) -> Engine:
+        # Creato (o ripreso dal giornale) al primo uso e dopo ogni release().
+        if self._engine is None:
+            self._engine = self.journal.resume(self.game, self.layout) if self.journal else Engine(self.layout)
+        return self._engine
+
+    def new_game(self) -> None:
+        """Nuova partita con lo stesso layout (nuova serata): giornale azzerato, seme nuovo."""
+        with self.lock:
+            if self.journal:
+                self.journal.reset(self.game)
+            self._engine = None
+            self.decision = None
+
+    def release(self) -> bool:
+        """Libera la partita in memoria, solo se il giornale può ricostruirla."""
+        if self.journal is None or self._engine is None:
+            return False
+        self._engine = None
+        self.decision = None
+        return True
+
+
+class SessionStats:
+    __slots__ = ("wheel", "started", "last_seen", "runs", "payload_bytes", "payload_total", "state_bytes")
+
+    def __init__(self, wheel: str):
+        self.wheel = wheel
+        self.started = self.last_seen = time.time()
+        self.runs = 0
+        self.payload_bytes = 0
+        self.payload_total = 0
+        self.state_bytes = 0
+
+
+class Host:
+    def __init__(self, layouts: Dict[str, Layout], journal: Optional[Journal] = None):
+        if not layouts:
+            raise ValueError("Nessuna ruota configurata")
+        self.wheels = {name: Wheel(name, layout, journal) for name, layout in layouts.items()}
+        self.default = next(iter(self.wheels))
+        self.sessions: Dict[str, SessionStats] = {}
+        self.telemetry = Telemetry()
+        self._lock = threading.Lock()
+        self._last_shed = time.time()
+
+    def wheel(self, name: Optional[str] = None) -> Wheel:
+        try:
+            return self.wheels[name or self.default]
+        except KeyError:
+            raise ValueError(f"Ruota sconosciuta: {name}. Disponibili: {', '.join(self.wheels)}") from None
+
+    def touch(self, session_id: str, wheel: str, payload: Dict, state: Dict) -> SessionStats:
+        """Aggiorna i contatori della sessione dopo un run (payload inviato, session_state)."""
+        with self._lock:
+            info = self.sessions.get(session_id)
+            if info is None or info.wheel != wheel:
+                info = self.sessions[session_id] = SessionStats(wheel)
+        info.last_seen = time.time()
+        info.runs += 1
+        info.payload_bytes = _json_size(payload)
+        info.payload_total += info.payload_bytes
+        info.state_bytes = deep_size(state, skip=(Wheel, Host))
+        return info
+
+    def shed(self, idle_seconds: float = IDLE_SESSION_SECONDS, is_active=None, close=None) -> List[str]:
+        """Dimentica le sessioni finite, poi libera le ruote senza spettatori.
+
+        Con ``is_active`` (runtime Streamlit) sono finite solo quelle disconnesse: un
+        kiosk fermo sulla ruota da ore resta. Senza, si va a tempo (``idle_seconds``).
+        ``close`` (tasto dell'operatore) chiude anche le connesse inattive da più di
+        ``idle_seconds``.
+        """
+        now = time.time()
+        with self._lock:
+            gone = []
+            for sid, info in self.sessions.items():
+                idle = now - info.last_seen > idle_seconds
+                if (not is_active(sid) if is_active else idle) or (close and idle):
+                    gone.append(sid)
+            for sid in gone:
+                del self.sessions[sid]
+            watched = {info.wheel for info in self.sessions.values()}
+            self._last_shed = now
+        self.telemetry.forget(gone)
+        for sid in gone:
+            if close and (is_active is None or is_active(sid)):
+                close(sid)
+        for name, wheel in self.wheels.items():
+            if name not in watched:
+                with wheel.lock:
+                    wheel.release()
+        return gone
+
+    def shed_due(self, every: float = 60) -> bool:
+        return time.time() - self._last_shed > every
+
+    def stats(self) -> Dict:
+        now = time.time()
+        sessions = [
+            {"session": sid[:8], "wheel": info.wheel, "idle_s": round(now - info.last_seen),
+             "runs": info.runs, "state_bytes": info.state_bytes, "payload_bytes": info.payload_bytes,
+             "payload_total": info.payload_total}
+            for sid, info in list(self.sessions.items())
+        ]
+        wheels = [
+            {"wheel": name, "sessions": sum(1 for s in sessions if s["wheel"] == name),
+             "loaded": w._engine is not None, "layout_bytes": w.payload_bytes,
+             "seed": getattr(w._engine.rng, "seed", None) if w._engine is not None else None,
+             "remaining": w._engine.remaining_prizes() if w._engine is not None else None,
+             "engine_bytes": deep_size(w._engine.state) if w._engine is not None else 0}
+            for name, w in self.wheels.items()
+        ]
+        return {
+            "rss_bytes": rss_bytes(),
+            "sessions": len(sessions),
+            "session_bytes": sum(s["state_bytes"] + s["payload_bytes"] for s in sessions),
+            "wheels": wheels,
+            "per_session": sessions,
+        }
+
+
+def _json_size(obj) -> int:
+    return len(json.dumps(obj, separators=(",", ":")))
+
+
+def deep_size(obj, skip: tuple = (), _seen: Optional[set] = None) -> int:
+    """Stima (byte) di un oggetto e di ciò che contiene; ``skip`` esclude i tipi condivisi."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or (skip and isinstance(obj, skip)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, skip, seen) + deep_size(v, skip, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, skip, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, s), skip, seen) for s in obj.__slots__ if hasattr(obj, s))
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), skip, seen)
+    return size
+
+
+def rss_bytes() -> int:
+    """Memoria residente del processo (Linux /proc; altrove il picco da ``resource``)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,137 @@
+"""Giornale di partita durevole (SQLite in WAL): refresh, crash o riavvio non perdono nulla.
+
+Ogni transizione applicata è una riga append-only minima: ``s`` (spin, con il
+segmento di partenza del giro) oppure ``o`` (OK sull'overlay, con il pacco scelto
+per MALUS_2). Dato lo start, ``Engine.spin`` è deterministico, quindi la partita si
+ricostruisce rigiocando le righe; ogni ``SNAPSHOT_EVERY`` righe si salva anche lo
+stato compatto (``GameState.to_dict``) e la ripresa parte dall'ultimo snapshot.
+La prima riga di una partita nuova è ``g``: seme del PRNG e modo di selezione, così
+la partita si rigioca anche dal solo seme (ruota/replay.py) e, alla ripresa, il
+PRNG continua dallo stesso punto della sequenza con lo stesso modo di selezione.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ruota.engine import Engine, GameState, Layout
+from ruota.rng import SeededRandom
+
+DEFAULT_PATH = os.environ.get("RUOTA_JOURNAL", "ruota.db")
+SNAPSHOT_EVERY = 32
+
+SPIN, OK, SEED = "s", "o", "g"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    t TEXT NOT NULL,
+    arg TEXT
+);
+CREATE INDEX IF NOT EXISTS events_game ON events (game, id);
+CREATE TABLE IF NOT EXISTS snapshots (
+    game TEXT NOT NULL,
+    event INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (game, event)
+);
+"""
+
+
+def game_id(key: str, layout: Layout) -> str:
+    """Id della partita: chiave del componente + impronta del layout (layout nuovo = partita nuova)."""
+    blob = json.dumps(layout.to_dict(), sort_keys=True, separators=(",", ":")).encode()
+    return f"{key}:{hashlib.sha256(blob).hexdigest()[:12]}"
+
+
+class Journal:
+    """Un file SQLite per processo, condiviso dalle sessioni; scritture serializzate da un lock."""
+
+    def __init__(self, path: str = DEFAULT_PATH, snapshot_every: int = SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL: append sequenziali senza riscrivere pagine; NORMAL basta contro i crash dell'app.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._since: Dict[str, int] = {}  # righe dall'ultimo snapshot, per partita
+        self.last_resume_ms = 0.0
+
+    def resume(self, game: str, layout: Layout, **engine_kw) -> Engine:
+        """Ultimo snapshot + coda del giornale, senza animazioni né estrazioni casuali."""
+        t0 = time.perf_counter()
+        with self._lock:
+            snap = self._db.execute(
+                "SELECT event, state FROM snapshots WHERE game = ? ORDER BY event DESC LIMIT 1",
+                (game,)).fetchone()
+            after = snap[0] if snap else 0
+            tail = self._db.execute(
+                "SELECT t, arg FROM events WHERE game = ? AND id > ? ORDER BY id",
+                (game, after)).fetchall()
+            seed = self._db.execute(
+                "SELECT arg FROM events WHERE game = ? AND t = ? ORDER BY id LIMIT 1",
+                (game, SEED)).fetchone()
+        data = json.loads(snap[1]) if snap else None
+        state = GameState.from_dict(data, layout.n_segs) if data else None
+        if seed:
+            # La partita continua con il modo con cui è cominciata, qualunque sia RUOTA_SELECTION ora.
+            engine_kw = dict(engine_kw, selection=json.loads(seed[0])["selection"])
+        engine = Engine(layout, state=state, **engine_kw)
+        if data and "g" in data:
+            engine.rng = SeededRandom(data["gs"], data["g"])
+        for t, arg in tail:
+            _apply(engine, t, arg)
+        self._since[game] = len(tail)
+        if not snap and not tail and isinstance(engine.rng, SeededRandom):
+            self.append(game, engine, SEED, json.dumps({"seed": engine.rng.seed, "selection": engine.selection}))
+        self.last_resume_ms = (time.perf_counter() - t0) * 1000
+        return engine
+
+    def events(self, game: str) -> List[Tuple[str, Optional[str]]]:
+        """Tutte le righe della partita, in ordine (per replay e verifiche)."""
+        with self._lock:
+            return self._db.execute("SELECT t, arg FROM events WHERE game = ? ORDER BY id", (game,)).fetchall()
+
+    def append(self, game: str, engine: Engine, t: str, arg: Optional[str] = None) -> None:
+        """Registra una transizione già applicata a ``engine``; ogni tanto anche lo snapshot."""
+        with self._lock:
+            cur = self._db.execute("INSERT INTO events (game, t, arg) VALUES (?, ?, ?)", (game, t, arg))
+            since = self._since.get(game, 0) + 1
+            if since >= self.snapshot_every:
+                data = engine.state.to_dict()
+                if isinstance(engine.rng, SeededRandom):
+                    data["gs"], data["g"] = engine.rng.seed, engine.rng.state
+                state = json.dumps(data, separators=(",", ":"))
+                self._db.execute("INSERT OR REPLACE INTO snapshots (game, event, state) VALUES (?, ?, ?)",
+                                 (game, cur.lastrowid, state))
+                since = 0
+            self._since[game] = since
+
+    def reset(self, game: str) -> None:
+        """Cancella la partita (nuova serata con lo stesso layout)."""
+        with self._lock:
+            self._db.execute("DELETE FROM events WHERE game = ?", (game,))
+            self._db.execute("DELETE FROM snapshots WHERE game = ?", (game,))
+            self._since.pop(game, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _apply(engine: Engine, t: str, arg: Optional[str]) -> None:
+    if t == SPIN:
+        start = int(arg)
+        engine.spin(start=start if start >= 0 else None)
+        if start >= 0 and isinstance(engine.rng, SeededRandom):
+            engine.rng.next_u32()  # dal vivo quello start è costato un'estrazione
+    elif t == OK:
+        engine.confirm(arg)
+    elif t == SEED:
+        engine.rng = SeededRandom(json.loads(arg)["seed"])
@@ -0,0 +1,153 @@
+"""Pipeline offline degli asset: varianti ottimizzate + manifest per app.py.
+
+Uso: ``python -m ruota.optimize [--assets assets] [--out assets/build]``
+
+Immagini -> WebP (e AVIF se Pillow lo supporta) a più larghezze.
+Audio    -> Opus + MP3 a bitrate ridotto via ffmpeg (SFX normalizzati in loudness).
+Gli input invariati (stesso sha256 e stesse impostazioni) vengono saltati.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from ruota.files import digest, load_json, write_atomic
+
+MANIFEST = "manifest.json"
+IMAGE_EXT = {".png", ".jpg", ".jpeg"}
+AUDIO_EXT = {".mp3", ".wav", ".ogg"}
+
+# Le card degli overlay sono larghe al massimo 380-500px: 2x per schermi HiDPI.
+IMAGE_WIDTHS = (384, 768, 1024)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+# La musica di sottofondo non si normalizza: solo gli effetti sonori.
+MUSIC = {"bgm.mp3"}
+OPUS_BITRATE = "64k"
+MP3_BITRATE = "96k"
+LOUDNORM = "loudnorm=I=-16:TP=-1.5:LRA=11"
+
+
+def _image_formats() -> List[str]:
+    from PIL import features
+
+    formats = ["webp"] if features.check("webp") else []
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def _settings(ext: str) -> str:
+    # Entra nella chiave di incrementalità: cambiare parametri o strumenti rigenera.
+    if ext in IMAGE_EXT:
+        data = [IMAGE_WIDTHS, WEBP_QUALITY, AVIF_QUALITY, _image_formats()]
+    else:
+        data = [OPUS_BITRATE, MP3_BITRATE, LOUDNORM, bool(shutil.which("ffmpeg"))]
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()[:12]
+
+
+def _build_image(src: str, out_dir: str, stem: str) -> List[Dict]:
+    from PIL import Image
+
+    variants = []
+    with Image.open(src) as im:
+        im.load()
+        widths = sorted({min(w, im.width) for w in IMAGE_WIDTHS})
+        for width in widths:
+            height = round(im.height * width / im.width)
+            resized = im if width == im.width else im.resize((width, height), Image.LANCZOS)
+            for fmt in _image_formats():
+                name = f"{stem}.{width}.{fmt}"
+                params = {"quality": WEBP_QUALITY, "method": 6} if fmt == "webp" else {"quality": AVIF_QUALITY}
+                resized.save(os.path.join(out_dir, name), fmt.upper(), **params)
+                variants.append({"file": name, "mime": f"image/{fmt}", "width": width})
+    return variants
+
+
+def _build_audio(src: str, out_dir: str, stem: str, is_music: bool) -> List[Dict]:
+    if not shutil.which("ffmpeg"):
+        print(f"  ffmpeg non trovato: {os.path.basename(src)} resta com'è", file=sys.stderr)
+        return []
+    filters = [] if is_music else ["-af", LOUDNORM]
+    outputs = [
+        (f"{stem}.opus", "audio/ogg; codecs=opus", ["-c:a", "libopus", "-b:a", OPUS_BITRATE]),
+        (f"{stem}.{MP3_BITRATE}.mp3", "audio/mpeg", ["-c:a", "libmp3lame", "-b:a", MP3_BITRATE]),
+    ]
+    variants = []
+    for name, mime, codec in outputs:
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", src, "-vn", *filters, *codec,
+               os.path.join(out_dir, name)]
+        subprocess.run(cmd, check=True)
+        variants.append({"file": name, "mime": mime, "width": 0})
+    return variants
+
+
+def build(assets_dir: str = "assets", out_dir: Optional[str] = None) -> Dict:
+    out_dir = out_dir or os.path.join(assets_dir, "build")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    previous = load_json(manifest_path).get("assets", {})
+    entries = {}
+
+    for name in sorted(os.listdir(assets_dir)):
+        src = os.path.join(assets_dir, name)
+        stem, ext = os.path.splitext(name)
+        ext = ext.lower()
+        if not os.path.isfile(src) or ext not in IMAGE_EXT | AUDIO_EXT:
+            continue
+        sha = digest(src)
+        settings = _settings(ext)
+        old = previous.get(name)
+        if (old and old["sha256"] == sha and old["settings"] == settings
+                and all(os.path.exists(os.path.join(out_dir, v["file"])) for v in old["variants"])):
+            entries[name] = old
+            status = "invariato"
+        else:
+            if ext in IMAGE_EXT:
+                variants = _build_image(src, out_dir, stem)
+            else:
+                variants = _build_audio(src, out_dir, stem, name in MUSIC)
+            for v in variants:
+                v["bytes"] = os.path.getsize(os.path.join(out_dir, v["file"]))
+            entries[name] = {"sha256": sha, "settings": settings, "bytes": os.path.getsize(src),
+                             "variants": variants}
+            status = "generato"
+        _report(name, entries[name], status)
+
+    manifest = {"version": 1, "assets": entries}
+    write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def _report(name: str, entry: Dict, status: str) -> None:
+    original = entry["bytes"]
+    if not entry["variants"]:
+        print(f"{name:<16} {original:>9} B  nessuna variante ({status})")
+        return
+    # Risparmio stimato sulla variante più grande servita (caso peggiore per il browser).
+    served = max(v["bytes"] for v in entry["variants"])
+    saved = original - served
+    print(f"{name:<16} {original:>9} B -> {served:>9} B  risparmio {saved:>9} B "
+          f"({100 * saved / max(1, original):.0f}%) [{status}]")
+
+
+def load_manifest(out_dir: str) -> Dict:
+    """Manifest letto da disco e tenuto in memoria finché non cambia."""
+    return load_json(os.path.join(out_dir, MANIFEST))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", default="assets")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+    build(args.assets, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
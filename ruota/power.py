@@ -0,0 +1,120 @@
+"""Misura il consumo del kiosk mentre la ruota gira in una modalità (full / low).
+
+Legge i contatori del kernel: energia RAPL del package CPU
+(``/sys/class/powercap/intel-rapl:*``) oppure, su portatili, la potenza della
+batteria (``/sys/class/power_supply/BAT*``). Ogni misura è una riga JSON con
+etichetta, così le due modalità si confrontano a parità di macchina e finestra.
+
+Uso tipico (avviare l'app con ``RUOTA_POWER=low RUOTA_MEASURE_SECONDS=60``)::
+
+    python -m ruota.power --label low --seconds 60 --frames '<json dalla console>'
+    python -m ruota.power --compare
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+POWERCAP = "/sys/class/powercap"
+POWER_SUPPLY = "/sys/class/power_supply"
+DEFAULT_LOG = "power.jsonl"
+
+
+def _read_int(path: str) -> int:
+    with open(path) as f:
+        return int(f.read().strip())
+
+
+def _rapl_domains() -> List[str]:
+    # Solo i package (intel-rapl:0, intel-rapl:1, ...), non i sotto-domini core/uncore.
+    return sorted(d for d in glob.glob(os.path.join(POWERCAP, "intel-rapl:*"))
+                  if d.count(":") == 1 and os.path.exists(os.path.join(d, "energy_uj")))
+
+
+def _battery_watts() -> Optional[Callable[[], float]]:
+    for bat in sorted(glob.glob(os.path.join(POWER_SUPPLY, "BAT*"))):
+        power_now = os.path.join(bat, "power_now")
+        if os.path.exists(power_now):
+            return lambda: _read_int(power_now) / 1e6
+        current, voltage = os.path.join(bat, "current_now"), os.path.join(bat, "voltage_now")
+        if os.path.exists(current) and os.path.exists(voltage):
+            return lambda: _read_int(current) * _read_int(voltage) / 1e12
+    return None
+
+
+def measure(seconds: float, interval: float = 1.0) -> Dict:
+    """Potenza media in watt sulla finestra; ``ValueError`` se non c'è un contatore."""
+    domains = _rapl_domains()
+    if domains:
+        ranges = [_read_int(os.path.join(d, "max_energy_range_uj")) for d in domains]
+        start = [_read_int(os.path.join(d, "energy_uj")) for d in domains]
+        t0 = time.monotonic()
+        time.sleep(seconds)
+        elapsed = time.monotonic() - t0
+        joules = 0.0
+        for d, r, e0 in zip(domains, ranges, start):
+            # Il contatore riparte da zero a max_energy_range_uj.
+            joules += ((_read_int(os.path.join(d, "energy_uj")) - e0) % r) / 1e6
+        return {"source": "rapl", "seconds": round(elapsed, 2), "watts": round(joules / elapsed, 3)}
+
+    read = _battery_watts()
+    if read is None:
+        raise ValueError("Nessun contatore di energia disponibile (RAPL o batteria)")
+    samples = []
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < seconds:
+        samples.append(read())
+        time.sleep(interval)
+    return {"source": "battery", "seconds": round(time.monotonic() - t0, 2),
+            "watts": round(sum(samples) / max(1, len(samples)), 3)}
+
+
+def compare(records: List[Dict]) -> Dict[str, Dict]:
+    """Media per etichetta di watt e durata dei frame (p50/p95) sulle misure registrate."""
+    out: Dict[str, Dict] = {}
+    for label in dict.fromkeys(r["label"] for r in records):
+        rows = [r for r in records if r["label"] == label]
+        frames = [r["frames"] for r in rows if r.get("frames")]
+        out[label] = {
+            "runs": len(rows),
+            "watts": round(sum(r["watts"] for r in rows) / len(rows), 3),
+            "frame_p50_ms": round(sum(f["p50"] for f in frames) / len(frames), 2) if frames else None,
+            "frame_p95_ms": round(sum(f["p95"] for f in frames) / len(frames), 2) if frames else None,
+            "fps": round(sum(f["fps"] for f in frames) / len(frames), 1) if frames else None,
+        }
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--label", default="full", help="modalità misurata (full, low, ...)")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--frames", default=None, help="statistiche frame dalla console del browser (JSON)")
+    parser.add_argument("--log", default=DEFAULT_LOG)
+    parser.add_argument("--compare", action="store_true", help="riassume le misure già registrate")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.log) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        print(json.dumps(compare(records), indent=2))
+        return 0
+
+    try:
+        record = measure(args.seconds)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    record["label"] = args.label
+    record["frames"] = json.loads(args.frames) if args.frames else None
+    with open(args.log, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    print(json.dumps(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from ruota.optimize import load_manifest
+from ruota.files import digest
+from ruota.static import ASSET_MODE, STATIC_URL, asset_url, mime_type
+
+
+@dataclass(frozen=True)
+class Asset:
+    id: str
+    path: str
+    mime: str
+    digest: str
+
+
+class AssetRegistry:
+    """Registro degli asset indirizzato per contenuto.
+
+    Ogni file è memorizzato una sola volta per hash (``blobs``) e riferito per
+    id: due id con lo stesso contenuto condividono lo stesso URL/data URI.
+    Se ``python -m ruota.optimize`` ha prodotto varianti per quel contenuto,
+    vengono esposte in ``variants`` (solo nelle modalità a URL: inline
+    significherebbe spedirle tutte nell'HTML).
+    """
+
+    def __init__(self, mode: str = ASSET_MODE, static_url: str = STATIC_URL):
+        self.mode = mode
+        self.static_url = static_url
+        self.assets: Dict[str, Asset] = {}
+        self.blobs: Dict[str, str] = {}
+        self.variants: Dict[str, List[list]] = {}
+
+    def add(self, asset_id: str, path: str) -> Asset:
+        full = digest(path)
+        key = full[:12]
+        if key not in self.blobs:
+            self.blobs[key] = asset_url(path, self.mode, self.static_url)
+            if self.mode != "inline":
+                self._add_variants(key, full, path)
+        asset = Asset(asset_id, path, mime_type(path), key)
+        self.assets[asset_id] = asset
+        return asset
+
+    def _add_variants(self, key: str, full_digest: str, path: str) -> None:
+        build_dir = os.path.join(os.path.dirname(path), "build")
+        entry = load_manifest(build_dir).get("assets", {}).get(os.path.basename(path))
+        # Manifest vecchio rispetto al file: meglio l'originale che una variante sbagliata.
+        if not entry or entry["sha256"] != full_digest:
+            return
+        found = [v for v in entry["variants"] if os.path.exists(os.path.join(build_dir, v["file"]))]
+        if found:
+            self.variants[key] = [
+                [asset_url(os.path.join(build_dir, v["file"]), self.mode, self.static_url), v["mime"], v["width"]]
+                for v in found
+            ]
+
+    def table(self, ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, str]]:
+        """Tabella compatta per il browser: id -> hash, hash -> src (+ varianti)."""
+        ids = list(self.assets) if ids is None else list(ids)
+        refs = {i: self.assets[i].digest for i in ids}
+        keys = set(refs.values())
+        return {
+            "ids": refs,
+            "blobs": {k: self.blobs[k] for k in keys},
+            "variants": {k: self.variants[k] for k in keys if k in self.variants},
+        }
+
@@ -0,0 +1,183 @@
+"""Replay deterministico: seme + input dell'operatore rigiocano una partita, fino a qualunque turno.
+
+Uso::
+
+    python -m ruota.replay record [--wheel ruota] [--db ruota.db] [--wheels wheels.json] [-o partita.json]
+    python -m ruota.replay play partita.json [--turn N] [--log]
+
+``record`` estrae dal giornale la registrazione della partita in corso: layout,
+seme del PRNG, modo di selezione, pacchi scelti per MALUS_2 e, per verifica, gli
+start registrati dal vivo. ``play`` la rigioca senza animazioni (millisecondi anche
+per migliaia di giocatori) e si ferma al turno richiesto: serve per contestazioni,
+audit e test di regressione. Se la registrazione ha sia il seme sia gli start, ogni
+giro rigiocato dal seme deve coincidere con quello registrato (altrimenti exit 1);
+le partite senza seme (giornali precedenti) si rigiocano dagli start.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ruota.engine import GIFT, MALUS, MALUS_2, SKIP, Engine, Layout
+from ruota.journal import OK, SEED, SPIN, Journal, game_id
+from ruota.rng import SeededRandom
+
+VERSION = 1
+KINDS = {GIFT: "premio", MALUS: "malus", SKIP: "salta"}
+
+
+def record(journal: Journal, name: str, layout: Layout) -> Dict:
+    """Registrazione della partita della ruota ``name`` dal giornale."""
+    game = game_id(name, layout)
+    engine = Engine(layout)
+    seed, selection = None, engine.selection
+    packs: List[str] = []
+    starts: List[int] = []
+    confirms = 0
+    for t, arg in journal.events(game):
+        if t == SEED:
+            info = json.loads(arg)
+            seed, selection = info["seed"], info["selection"]
+        elif t == SPIN:
+            start = int(arg)
+            starts.append(start)
+            engine.spin(start=start if start >= 0 else None)
+        elif t == OK:
+            if engine.state.pending >= 0 and layout.seg_id(engine.state.pending) == MALUS_2:
+                packs.append(arg)
+            engine.confirm(arg)
+            confirms += 1
+    return {
+        "version": VERSION,
+        "game": game,
+        "seed": seed,
+        "selection": selection,
+        "layout": {"players": list(layout.players), "prizes": list(layout.prizes),
+                   "malus": list(layout.malus), "positions": list(layout.malus_positions)},
+        "packs": packs,
+        "spins": len(starts),
+        "confirms": confirms,
+        "starts": starts,
+    }
+
+
+def replay(rec: Dict, turn: Optional[int] = None) -> Tuple[Engine, List[Dict]]:
+    """Rigioca ``rec`` fino a ``turn`` giri (default: tutti quelli registrati).
+
+    Ritorna il motore nello stato raggiunto e un riassunto per giro. ValueError se
+    la registrazione non è valida o se il seme non riproduce gli start registrati.
+    """
+    if rec.get("version") != VERSION:
+        raise ValueError(f"versione della registrazione non supportata: {rec.get('version')}")
+    spec = rec["layout"]
+    layout = Layout(tuple(spec["players"]), tuple(spec["prizes"]),
+                    malus=tuple(spec["malus"]), malus_positions=tuple(spec["positions"]))
+    seed, starts = rec.get("seed"), rec.get("starts")
+    if seed is None and starts is None:
+        raise ValueError("servono il seme o gli start registrati")
+    engine = Engine(layout, rng=SeededRandom(seed) if seed is not None else None,
+                    selection=rec.get("selection", "direct"))
+    spins = rec.get("spins", len(starts) if starts is not None else None)
+    confirms = rec.get("confirms")
+    if turn is not None:
+        spins = turn if spins is None else min(turn, spins)
+    packs = list(rec.get("packs", ()))
+
+    log: List[Dict] = []
+    while not engine.finished() and (spins is None or len(log) < spins):
+        k = len(log)
+        outcome = engine.spin(start=None if seed is not None else _live_start(starts[k]))
+        if seed is not None and starts is not None and k < len(starts) and outcome.start != starts[k]:
+            raise ValueError(f"giro {k + 1}: il seme dà start {outcome.start}, registrato {starts[k]}")
+        entry = {"turn": k + 1, "player": layout.players[outcome.player],
+                 "kind": KINDS.get(outcome.kind, "nessuno"),
+                 "segment": layout.seg_id(outcome.final) if outcome.final >= 0 else None,
+                 "start": outcome.start, "nudges": len(outcome.steps)}
+        log.append(entry)
+        if engine.state.pending < 0:
+            continue
+        if confirms is not None and confirms <= 0:
+            break  # registrata con l'overlay ancora aperto
+        pack = None
+        if entry["segment"] == MALUS_2:
+            if not packs:
+                raise ValueError(f"giro {k + 1}: manca il pacco scelto per MALUS_2")
+            pack = entry["pack"] = packs.pop(0)
+        engine.confirm(pack)
+        if confirms is not None:
+            confirms -= 1
+    return engine, log
+
+
+def _live_start(start: int) -> Optional[int]:
+    return start if start >= 0 else None
+
+
+def summary(engine: Engine) -> Dict:
+    layout, s = engine.layout, engine.state
+    return {
+        "finished": engine.finished(),
+        "remaining": engine.remaining_prizes(),
+        "current": layout.players[engine.current_player()],
+        "pending": layout.seg_id(s.pending) if s.pending >= 0 else None,
+        "order": [layout.players[p] for p in s.order.to_list()],
+        "assigned": {layout.players[p]: layout.prizes[a] for p, a in enumerate(s.assigned) if a >= 0},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ruota.hosting import DEFAULT_WHEEL, WHEELS_PATH, load_wheels
+    from ruota.journal import DEFAULT_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec_p = sub.add_parser("record", help="registrazione della partita dal giornale")
+    rec_p.add_argument("--wheel", default=None)
+    rec_p.add_argument("--db", default=DEFAULT_PATH)
+    rec_p.add_argument("--wheels", default=WHEELS_PATH, help="configurazione delle ruote (RUOTA_WHEELS)")
+    rec_p.add_argument("-o", "--output", default=None)
+    play_p = sub.add_parser("play", help="rigioca una registrazione fino a un turno")
+    play_p.add_argument("record")
+    play_p.add_argument("--turn", type=int, default=None, help="numero di giri da rigiocare (default: tutti)")
+    play_p.add_argument("--log", action="store_true", help="anche il riassunto di ogni giro")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "record":
+            if not os.path.exists(args.db):
+                raise ValueError(f"{args.db}: giornale inesistente")
+            layouts = load_wheels(args.wheels)
+            name = args.wheel or (DEFAULT_WHEEL if DEFAULT_WHEEL in layouts else next(iter(layouts)))
+            if name not in layouts:
+                raise ValueError(f"Ruota sconosciuta: {name}. Disponibili: {', '.join(layouts)}")
+            journal = Journal(args.db)
+            try:
+                rec = record(journal, name, layouts[name])
+            finally:
+                journal.close()
+            out = json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(out + "\n")
+            else:
+                print(out)
+            return 0
+
+        with open(args.record, encoding="utf-8") as f:
+            rec = json.load(f)
+        t0 = time.perf_counter()
+        engine, log = replay(rec, args.turn)
+        result = dict(turn=len(log), elapsed_ms=round((time.perf_counter() - t0) * 1000, 2), **summary(engine))
+        if args.log:
+            result["log"] = log
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"errore: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
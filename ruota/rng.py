@@ -0,0 +1,43 @@
+"""PRNG seminabile: mulberry32 (32 bit di stato, solo operazioni intere a 32 bit).
+
+Estrae solo Python (il browser anima le decisioni di ``Engine``). Ogni partita
+nasce con un seme (``Engine.rng.seed``): seme + input dell'operatore (i pacchi di
+MALUS_2) bastano a rigiocarla, vedi ruota/replay.py.
+"""
+import secrets
+from typing import Optional
+
+MASK = 0xFFFFFFFF
+
+
+def _imul(a: int, b: int) -> int:
+    return (a * b) & MASK
+
+
+def new_seed() -> int:
+    return secrets.randbits(32)
+
+
+class SeededRandom:
+    """Sottoinsieme di ``random.Random`` usato da ``Engine`` (``randrange``, ``random``)."""
+
+    __slots__ = ("seed", "state")
+
+    def __init__(self, seed: Optional[int] = None, state: Optional[int] = None):
+        self.seed = (new_seed() if seed is None else int(seed)) & MASK
+        self.state = self.seed if state is None else int(state) & MASK
+
+    def next_u32(self) -> int:
+        a = self.state = (self.state + 0x6D2B79F5) & MASK
+        t = _imul(a ^ (a >> 15), a | 1)
+        t = ((t + _imul(t ^ (t >> 7), t | 61)) & MASK) ^ t
+        return (t ^ (t >> 14)) & MASK
+
+    def random(self) -> float:
+        return self.next_u32() / 2 ** 32
+
+    def randrange(self, n: int) -> int:
+        """Un'estrazione per chiamata, anche per n grandi: il replay conta le estrazioni."""
+        if n <= 0:
+            raise ValueError("randrange: n deve essere positivo")
+        return (self.next_u32() * n) >> 32
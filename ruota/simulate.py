@@ -0,0 +1,252 @@
+"""Simulatore Monte Carlo vettorizzato (NumPy) per valutare l'equità della ruota.
+
+Gioca milioni di partite a lotti, con le stesse regole di ``ruota.engine``:
+ogni passo avanza in parallelo tutte le partite del lotto ancora in corso.
+
+Uso: ``python -m ruota.simulate --games 1000000 [--positions 0,3,7,10] [--html out.html]``
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ruota.engine import (DEFAULT_SELECTION, MALUS_1, MALUS_2, MALUS_3, MALUS_4, SELECTION_MODES, Layout,
+                          default_layout, spread_positions)
+
+MAX_STEPS = 10_000
+
+
+@dataclass
+class SimResult:
+    layout: Layout
+    games: int
+    seg_hits: np.ndarray        # (S,) atterraggi finali per segmento
+    seg_nudged: np.ndarray      # (S,) atterraggi arrivati tramite nudge
+    spins: np.ndarray           # (max+1,) istogramma degli spin per partita
+    malus_by_player: np.ndarray  # (P, M) malus subiti per giocatore e tipo
+    seconds: float
+
+    @property
+    def hit_rate(self) -> np.ndarray:
+        return self.seg_hits / max(1, self.seg_hits.sum())
+
+    @property
+    def mean_spins(self) -> float:
+        return float((np.arange(len(self.spins)) * self.spins).sum() / max(1, self.games))
+
+    def percentile_spins(self, q: float) -> int:
+        cdf = np.cumsum(self.spins) / max(1, self.games)
+        return int(np.searchsorted(cdf, q / 100))
+
+    def summary(self) -> Dict:
+        exposure = self.malus_by_player.sum(axis=1) / max(1, self.games)
+        return {
+            "games": self.games,
+            "seconds": round(self.seconds, 3),
+            "mean_spins": round(self.mean_spins, 3),
+            "p50_spins": self.percentile_spins(50),
+            "p95_spins": self.percentile_spins(95),
+            "hit_rate": {self.layout.seg_id(i): round(float(r), 5) for i, r in enumerate(self.hit_rate)},
+            "malus_per_game": {p: round(float(e), 4) for p, e in zip(self.layout.players, exposure)},
+        }
+
+
+def _simulate_batch(layout: Layout, n: int, rng: np.random.Generator, pack_policy: str, selection: str):
+    S, P = layout.n_segs, len(layout.players)
+    seg_ref = np.array(layout.seg_ref)
+    is_prize = seg_ref >= 0
+    malus_kind = np.full(S, -1)
+    for i, ref in enumerate(layout.seg_ref):
+        if ref < 0:
+            malus_kind[i] = (MALUS_1, MALUS_2, MALUS_3, MALUS_4).index(layout.malus[~ref])
+    prize_seg = np.array(layout.prize_seg)
+
+    rows = np.arange(n)
+    burned = np.zeros((n, S), dtype=bool)
+    order = np.tile(np.arange(P), (n, 1))
+    pos = order.copy()
+    turn = np.zeros(n, dtype=np.int64)
+    assigned = np.zeros((n, P), dtype=bool)
+    spins = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    seg_hits = np.zeros(S, dtype=np.int64)
+    seg_nudged = np.zeros(S, dtype=np.int64)
+    malus_by_player = np.zeros((P, 4), dtype=np.int64)
+    offsets = np.arange(S)
+    cols = np.arange(P)
+
+    for _ in range(MAX_STEPS):
+        g = rows[active]
+        if g.size == 0:
+            break
+        player = order[g, turn[g]]
+
+        # Giocatore già servito: il tasto SPIN fa solo avanzare il turno.
+        skip = assigned[g, player]
+        if skip.any():
+            gs = g[skip]
+            turn[gs] = (pos[gs, player[skip]] + 1) % P
+        g, player = g[~skip], player[~skip]
+        if g.size == 0:
+            continue
+
+        spins[g] += 1
+        if selection == "direct":
+            # Estrazione uniforme fra i segmenti vivi.
+            final = np.argmax(~burned[g] * rng.random((g.size, S)), axis=1)
+            k = np.zeros(g.size, dtype=np.int64)
+        else:
+            start = rng.integers(0, S, size=g.size)
+            # Nudge orario: primo segmento libero a partire da start (ciclico).
+            ring = (start[:, None] + offsets) % S
+            k = np.argmax(~burned[g[:, None], ring], axis=1)
+            final = (start + k) % S
+        np.add.at(seg_hits, final, 1)
+        np.add.at(seg_nudged, final[k > 0], 1)
+        burned[g, final] = True
+
+        prize = is_prize[final]
+        kind = malus_kind[final]
+        np.add.at(malus_by_player, (player[~prize], kind[~prize]), 1)
+
+        # Premio o MALUS_2 (pacco scelto a mano): il giocatore è servito.
+        m2 = kind == 1
+        if m2.any():
+            g2 = g[m2]
+            free = ~burned[g2][:, prize_seg]
+            if pack_policy == "first":
+                pick = np.argmax(free, axis=1)
+            else:
+                weights = free * rng.random(free.shape)
+                pick = np.argmax(weights, axis=1)
+            burned[g2, prize_seg[pick]] = True
+        served = prize | m2
+        assigned[g[served], player[served]] = True
+
+        # MALUS_1: scambio con il successivo; il turno resta sulla stessa posizione.
+        m1 = kind == 0
+        if m1.any():
+            g1, t1 = g[m1], turn[g[m1]]
+            nxt = (t1 + 1) % P
+            a, b = order[g1, t1], order[g1, nxt]
+            order[g1, t1], order[g1, nxt] = b, a
+            pos[g1, b], pos[g1, a] = t1, nxt
+
+        # MALUS_3: in fondo alla fila, poi il turno riparte dalla prima posizione.
+        m3 = kind == 2
+        if m3.any():
+            g3 = g[m3]
+            i3 = pos[g3, player[m3]][:, None]
+            src = np.where(cols < i3, cols, cols + 1)
+            src[:, -1] = i3[:, 0]
+            order[g3] = np.take_along_axis(order[g3], src, axis=1)
+            pos[g3] = _inverse(order[g3])
+
+        # Premi e MALUS_2 avanzano dal giocatore; MALUS_3 riparte da 0; MALUS_1/4 restano.
+        adv = prize | m2
+        if adv.any():
+            ga = g[adv]
+            turn[ga] = (pos[ga, player[adv]] + 1) % P
+        turn[g[m3]] = 0
+
+        active[g] = ~burned[g][:, prize_seg].all(axis=1)
+
+    return seg_hits, seg_nudged, spins, malus_by_player
+
+
+def _inverse(order: np.ndarray) -> np.ndarray:
+    inv = np.empty_like(order)
+    np.put_along_axis(inv, order, np.arange(order.shape[1])[None, :].repeat(order.shape[0], 0), axis=1)
+    return inv
+
+
+def simulate(layout: Optional[Layout] = None, games: int = 1_000_000, batch: int = 200_000,
+             seed: Optional[int] = None, pack_policy: str = "random",
+             selection: str = DEFAULT_SELECTION) -> SimResult:
+    layout = layout or default_layout()
+    rng = np.random.default_rng(seed)
+    S, P = layout.n_segs, len(layout.players)
+    seg_hits = np.zeros(S, dtype=np.int64)
+    seg_nudged = np.zeros(S, dtype=np.int64)
+    malus_by_player = np.zeros((P, 4), dtype=np.int64)
+    spins_hist = np.zeros(1, dtype=np.int64)
+
+    t0 = time.perf_counter()
+    done = 0
+    while done < games:
+        n = min(batch, games - done)
+        hits, nudged, spins, mbp = _simulate_batch(layout, n, rng, pack_policy, selection)
+        seg_hits += hits
+        seg_nudged += nudged
+        malus_by_player += mbp
+        counts = np.bincount(spins)
+        if len(counts) > len(spins_hist):
+            spins_hist = np.pad(spins_hist, (0, len(counts) - len(spins_hist)))
+        spins_hist[:len(counts)] += counts
+        done += n
+    return SimResult(layout, games, seg_hits, seg_nudged, spins_hist, malus_by_player,
+                     time.perf_counter() - t0)
+
+
+def figures(result: SimResult) -> Dict[str, "object"]:
+    """Grafici plotly: hit rate per segmento, spin per partita, esposizione ai malus."""
+    import plotly.graph_objects as go
+
+    layout = result.layout
+    ids = [layout.seg_id(i) for i in range(layout.n_segs)]
+    colors = ["#D8A83A" if ref < 0 else "#B51E1E" for ref in layout.seg_ref]
+    total = max(1, result.seg_hits.sum())
+
+    hits = go.Figure()
+    hits.add_bar(x=ids, y=(result.seg_hits - result.seg_nudged) / total, name="diretto", marker_color=colors)
+    hits.add_bar(x=ids, y=result.seg_nudged / total, name="via nudge", marker_color="#7A7A7A")
+    hits.add_hline(y=1 / layout.n_segs, line_dash="dot", annotation_text="uniforme")
+    hits.update_layout(barmode="stack", title="Frequenza di atterraggio per segmento", yaxis_tickformat=".1%")
+
+    spins = go.Figure(go.Bar(x=np.arange(len(result.spins)), y=result.spins / max(1, result.games)))
+    spins.update_layout(title=f"Spin per partita (media {result.mean_spins:.2f})",
+                        xaxis_title="spin", yaxis_tickformat=".1%")
+
+    exposure = go.Figure()
+    for m, name in enumerate((MALUS_1, MALUS_2, MALUS_3, MALUS_4)):
+        exposure.add_bar(x=list(layout.players), y=result.malus_by_player[:, m] / max(1, result.games), name=name)
+    exposure.update_layout(barmode="stack", title="Malus per partita, per giocatore (ordine iniziale)")
+    return {"hits": hits, "spins": spins, "exposure": exposure}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=200_000)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--prizes", type=int, default=10)
+    parser.add_argument("--positions", default=None, help="posizioni dei 4 malus (default: distribuiti)")
+    parser.add_argument("--pack-policy", choices=("random", "first"), default="random")
+    parser.add_argument("--selection", choices=SELECTION_MODES, default=DEFAULT_SELECTION)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--html", default=None, help="scrive i grafici plotly in questo file")
+    args = parser.parse_args(argv)
+
+    layout = default_layout(args.players, args.prizes)
+    if args.positions:
+        positions = tuple(int(x) for x in args.positions.split(","))
+    else:
+        positions = spread_positions(layout.n_segs)
+    layout = Layout(layout.players, layout.prizes, malus_positions=positions)
+    result = simulate(layout, args.games, args.batch, args.seed, args.pack_policy, args.selection)
+
+    print(json.dumps(result.summary(), indent=2))
+    if args.html:
+        with open(args.html, "w") as f:
+            for i, fig in enumerate(figures(result).values()):
+                f.write(fig.to_html(full_html=False, include_plotlyjs="cdn" if i == 0 else False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import mimetypes
+import os
+import shutil
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from ruota.assets import asset_cache
+from ruota.files import digest
+
+# Modalità di consegna dei media al browser:
+#   static -> copie con hash servite da Streamlit su app/static/ (stessa origine
+#             della pagina); default. Niente header di cache: il browser riconvalida
+#   server -> copie con hash servite da un piccolo endpoint HTTP con cache lunga
+#             (Cache-Control immutable, un anno); anche il bundle del componente
+#             arriva da lì, quindi serve RUOTA_ASSET_URL raggiungibile dai kiosk
+#             (e in HTTPS se la pagina è in HTTPS)
+#   inline -> data URI base64 dentro l'HTML (comportamento storico)
+ASSET_MODE = os.environ.get("RUOTA_ASSET_MODE", "static")
+ASSET_PORT = int(os.environ.get("RUOTA_ASSET_PORT", "8765"))
+# URL pubblico dell'endpoint "server" come lo vede il browser del kiosk: obbligatorio in
+# modalità server, localhost andrebbe bene solo per un browser sulla stessa macchina.
+ASSET_URL = os.environ.get("RUOTA_ASSET_URL", "")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, "static", "assets")
+# Percorso relativo: l'iframe srcdoc risolve rispetto all'URL della pagina Streamlit.
+STATIC_URL = "app/static/assets/"
+
+_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def mime_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def hashed_name(path: str) -> str:
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"{stem}.{digest(path)[:12]}{ext}"
+
+
+def publish(path: str) -> str:
+    """Copia il file in static/assets con l'hash nel nome (idempotente)."""
+    name = hashed_name(path)
+    target = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+    return name
+
+
+class _ImmutableHandler(SimpleHTTPRequestHandler):
+    # I nomi contengono l'hash del contenuto: il browser può tenerli per un anno.
+    def end_headers(self):
+        # Tranne il service worker: nome fisso, va sempre riconvalidato.
+        if self.path.split("?")[0].endswith("/sw.js"):
+            self.send_header("Cache-Control", "no-cache")
+        else:
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+    def send_head(self):
+        # Varianti precompresse (bundle): file.br / file.gz accanto all'originale.
+        path = self.translate_path(self.path)
+        accept = self.headers.get("Accept-Encoding", "")
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accept and os.path.isfile(path + suffix):
+                f = open(path + suffix, "rb")
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(path))
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return f
+        return super().send_head()
+
+    def list_directory(self, path):
+        self.send_error(404)
+        return None
+
+    def log_message(self, format, *args):
+        pass
+
+
+def ensure_server() -> None:
+    """Avvia l'endpoint della modalità server (una volta per processo).
+
+    ValueError senza RUOTA_ASSET_URL o se la porta è occupata: un altro processo
+    (o un'istanza vecchia con altri hash) servirebbe file che non sono i nostri.
+    """
+    global _server
+    with _lock:
+        if _server is not None:
+            return
+        if not ASSET_URL:
+            raise ValueError("RUOTA_ASSET_MODE=server richiede RUOTA_ASSET_URL "
+                             f"(es. http://<host>:{ASSET_PORT}/, come lo vedono i kiosk)")
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        handler = partial(_ImmutableHandler, directory=STATIC_DIR)
+        try:
+            _server = ThreadingHTTPServer(("0.0.0.0", ASSET_PORT), handler)
+        except OSError as exc:
+            raise ValueError(f"RUOTA_ASSET_PORT={ASSET_PORT} non disponibile: {exc.strerror or exc}") from exc
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="ruota-assets", daemon=True).start()
+
+
+def asset_url(path: str, mode: str = ASSET_MODE, static_url: str = STATIC_URL) -> str:
+    """URL (o data URI) con cui il browser deve caricare il file.
+
+    ``static_url`` è il prefisso di app/static/ visto dal documento che carica
+    il file (cambia fra un iframe srcdoc e un componente servito da /component/).
+    """
+    if mode == "inline":
+        return f"data:{mime_type(path)};base64,{asset_cache.b64(path)}"
+    name = publish(path)
+    if mode == "server":
+        ensure_server()
+        return ASSET_URL + name
+    return static_url + name
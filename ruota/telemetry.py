@@ -0,0 +1,148 @@
+"""Telemetria del frontend: istogrammi per sessione e per dispositivo.
+
+Con ``RUOTA_TELEMETRY=<secondi>`` il browser (frontend/telemetry.js) spedisce a
+lotti i campioni ``[metrica, valore]`` raccolti negli hook (giro, nudge, etichette,
+UI, overlay, avvio dell'audio, long task, frame persi). Qui finiscono in istogrammi
+a bucket fissi: memoria costante per metrica, qualunque sia il numero di campioni.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+# Limiti superiori dei bucket (ms, o conteggi per le metriche *.dropped); l'ultimo
+# bucket raccoglie tutto il resto. 6000/6100 separano il giro puntuale da quello in ritardo.
+EDGES = (1, 2, 4, 8, 16, 33, 50, 100, 250, 500, 1000, 2000, 4000, 6000, 6100, 6500, 8000)
+MAX_METRICS = 64  # per chiave: un client impazzito non fa crescere la memoria
+# Dispositivi tenuti (l'id lo sceglie il client): oltre, si dimentica quello visto meno di recente.
+MAX_DEVICES = 256
+MAX_NAME = 32
+
+
+class Histogram:
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(EDGES) + 1)
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(EDGES, value)] += 1
+        self.n += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Limite superiore del bucket che contiene il quantile ``q``."""
+        rank, seen = q * self.n, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return min(EDGES[i], self.max) if i < len(EDGES) else self.max
+        return 0.0
+
+
+def bucket_labels() -> List[str]:
+    return [f"≤{e}" for e in EDGES] + [f">{EDGES[-1]}"]
+
+
+class Telemetry:
+    """Aggregatore di processo, condiviso da tutte le sessioni (vive in ``Host``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions: Dict[str, Dict[str, Histogram]] = {}
+        self.devices: Dict[str, Dict[str, Histogram]] = {}
+        self.device_info: Dict[str, Dict] = {}
+        self.lost = 0
+
+    def add(self, session_id: str, batch: Dict) -> int:
+        """Aggiunge un lotto del browser; ritorna i campioni accettati."""
+        device = str(batch.get("dev") or "?")[:16]
+        accepted = 0
+        with self._lock:
+            if device not in self.device_info and len(self.device_info) >= MAX_DEVICES:
+                oldest = min(self.device_info, key=lambda d: self.device_info[d]["last_seen"])
+                self.device_info.pop(oldest)
+                self.devices.pop(oldest, None)
+            info = self.device_info.setdefault(device, {"ua": "", "batches": 0})
+            if batch.get("ua"):
+                info["ua"] = str(batch["ua"])[:200]
+            info["batches"] += 1
+            info["session"] = session_id[:8]
+            info["last_seen"] = time.time()
+            self.lost += int(batch.get("lost") or 0)
+            by_session = self.sessions.setdefault(session_id, {})
+            by_device = self.devices.setdefault(device, {})
+            for sample in batch.get("s") or ():
+                try:
+                    name, value = str(sample[0])[:MAX_NAME], float(sample[1])
+                except (TypeError, ValueError, IndexError):
+                    continue
+                if not math.isfinite(value) or value < 0:
+                    continue
+                for table in (by_session, by_device):
+                    hist = table.get(name)
+                    if hist is None:
+                        if len(table) >= MAX_METRICS:
+                            continue
+                        hist = table[name] = Histogram()
+                    hist.add(value)
+                accepted += 1
+        return accepted
+
+    def forget(self, session_ids: Iterable[str]) -> None:
+        with self._lock:
+            for sid in session_ids:
+                self.sessions.pop(sid, None)
+
+    def _scope(self, by: str) -> Dict[str, Dict[str, Histogram]]:
+        if by not in ("device", "session"):
+            raise ValueError("by deve essere 'device' o 'session'")
+        return self.devices if by == "device" else self.sessions
+
+    def metrics(self) -> List[str]:
+        with self._lock:
+            return sorted({name for table in self.devices.values() for name in table})
+
+    def table(self, by: str = "device") -> List[Dict]:
+        """Una riga per (chiave, metrica): campioni, media, p50, p95 (per bucket) e massimo."""
+        scope = self._scope(by)
+        with self._lock:
+            return [
+                {by: key[:8], "metric": name, "n": h.n, "mean": round(h.total / h.n, 1),
+                 "p50": h.quantile(0.5), "p95": h.quantile(0.95), "max": round(h.max, 1)}
+                for key, table in sorted(scope.items())
+                for name, h in sorted(table.items()) if h.n
+            ]
+
+    def histograms(self, metric: str, by: str = "device") -> Dict[str, List[int]]:
+        """Conteggi per bucket di una metrica, per ogni dispositivo o sessione."""
+        scope = self._scope(by)
+        with self._lock:
+            return {key[:8]: list(table[metric].counts) for key, table in scope.items() if metric in table}
+
+    def device_rows(self) -> List[Dict]:
+        now = time.time()
+        with self._lock:
+            return [
+                {"device": dev, "session": info.get("session", ""), "batches": info["batches"],
+                 "idle_s": round(now - info.get("last_seen", now)), "ua": info["ua"]}
+                for dev, info in self.device_info.items()
+            ]
+
+
+def figure(telemetry: Telemetry, metric: str, by: str = "device", title: Optional[str] = None):
+    """Istogramma plotly della metrica, una serie per dispositivo o sessione."""
+    import plotly.graph_objects as go
+
+    labels = bucket_labels()
+    fig = go.Figure()
+    for key, counts in sorted(telemetry.histograms(metric, by).items()):
+        fig.add_trace(go.Bar(x=labels, y=counts, name=key))
+    fig.update_layout(title=title or metric, barmode="group", xaxis_title="bucket",
+                      yaxis_title="campioni", height=360, margin=dict(l=40, r=20, t=40, b=40))
+    return fig
@@ -0,0 +1,52 @@
+"""Profili di tempo del frontend: quanto durano giro, nudge, blocco degli overlay e dissolvenze.
+
+Le regole non cambiano con il profilo (``Engine`` decide sempre allo stesso modo,
+rotazione compresa): cambia solo quanto il browser impiega a mettere in scena.
+
+- ``ceremony``: i tempi storici (giro di 6 s, OK bloccato per 12 s);
+- ``fast``: per le serate affollate, stesso spettacolo più corto;
+- ``turbo``: nessuna animazione né SFX, ogni giro si risolve subito (test, prove).
+"""
+import os
+from typing import Dict
+
+PROFILES: Dict[str, Dict] = {
+    "ceremony": {
+        "spin_ms": 6000,
+        "spin_ease": [0.10, 0.75, 0.10, 1],
+        "nudge_ms": 280,
+        "nudge_step_ms": 300,
+        "lock_ms": 12000,
+        "fade_out_ms": 350,
+        "fade_in_ms": 450,
+        "sfx": True,
+    },
+    "fast": {
+        "spin_ms": 2500,
+        "spin_ease": [0.20, 0.70, 0.20, 1],
+        "nudge_ms": 140,
+        "nudge_step_ms": 150,
+        "lock_ms": 2500,
+        "fade_out_ms": 200,
+        "fade_in_ms": 250,
+        "sfx": True,
+    },
+    "turbo": {
+        "spin_ms": 0,
+        "spin_ease": [0, 0, 1, 1],
+        "nudge_ms": 0,
+        "nudge_step_ms": 0,
+        "lock_ms": 0,
+        "fade_out_ms": 0,
+        "fade_in_ms": 0,
+        "sfx": False,
+    },
+}
+DEFAULT_PROFILE = os.environ.get("RUOTA_TIMING", "ceremony")
+
+
+def profile(name: str = DEFAULT_PROFILE) -> Dict:
+    try:
+        return dict(PROFILES[name], name=name)
+    except KeyError:
+        raise ValueError(f"Profilo di tempo sconosciuto: {name}. Disponibili: {', '.join(PROFILES)}") from None
@@ -0,0 +1,146 @@
+import pytest
+
+from ruota.engine import (GIFT, MALUS, MALUS_1, MALUS_2, MALUS_3, MALUS_4, NONE, SKIP, Engine, Layout,
+                          default_layout, play)
+from ruota.rng import SeededRandom
+
+# default_layout(): 14 segmenti, malus in 0 (MALUS_1), 3 (MALUS_2), 7 (MALUS_3), 10 (MALUS_4).
+SEG = {MALUS_1: 0, MALUS_2: 3, MALUS_3: 7, MALUS_4: 10}
+
+
+def engine(selection="direct", seed=1):
+    return Engine(default_layout(), rng=SeededRandom(seed), selection=selection)
+
+
+def _free_pack(e):
+    return next(e.layout.prizes[p] for p, seg in enumerate(e.layout.prize_seg) if not e.is_burned(seg))
+
+
+def _confirm(e, out):
+    e.confirm(_free_pack(e) if e.layout.seg_id(out.final) == MALUS_2 else None)
+
+
+def test_mulberry32_reference_value_and_resume():
+    # mulberry32(42) della versione JS di riferimento: 0.6011037519201636 * 2**32.
+    assert SeededRandom(42).next_u32() == 2581720956
+    rng = SeededRandom(7)
+    rng.randrange(14)
+    resumed = SeededRandom(7, rng.state)
+    assert [rng.randrange(1000) for _ in range(5)] == [resumed.randrange(1000) for _ in range(5)]
+
+
+def test_gift_assigns_and_advances_after_ok():
+    e = engine()
+    out = e.spin(start=1)
+    assert (out.kind, out.player, out.final, out.steps) == (GIFT, 0, 1, ())
+    assert e.state.pending == 1 and e.state.assigned[0] == 0
+    e.confirm()
+    assert e.state.pending == -1 and e.current_player() == 1 and e.remaining_prizes() == 9
+
+
+def test_malus_1_swaps_with_next_player_who_is_skipped():
+    e = engine()
+    assert e.spin(start=SEG[MALUS_1]).kind == MALUS
+    e.confirm()
+    assert e.state.order.to_list()[:2] == [1, 0]
+    assert e.current_player() == 1
+    e.spin(start=1)
+    e.confirm()
+    assert e.current_player() == 0
+
+
+def test_malus_2_needs_a_free_pack():
+    e = engine()
+    e.spin(start=SEG[MALUS_2])
+    with pytest.raises(ValueError):
+        e.confirm(None)
+    with pytest.raises(ValueError):
+        e.confirm("11")
+    assert e.state.pending == SEG[MALUS_2]
+    e.confirm("5")
+    assert e.state.assigned[0] == 4 and e.is_burned(e.layout.prize_seg[4])
+    assert e.remaining_prizes() == 9 and e.current_player() == 1
+
+
+def test_malus_2_rejects_a_pack_already_won():
+    e = engine()
+    e.spin(start=1)  # premio "1" al giocatore 0
+    e.confirm()
+    e.spin(start=SEG[MALUS_2])
+    with pytest.raises(ValueError, match="già assegnato"):
+        e.confirm("1")
+    assert e.state.pending == SEG[MALUS_2]
+
+
+def test_malus_3_sends_player_to_the_back():
+    e = engine()
+    e.spin(start=SEG[MALUS_3])
+    e.confirm()
+    assert e.state.order.to_list()[-1] == 0
+    assert e.current_player() == 1
+
+
+def test_malus_4_spins_again():
+    e = engine()
+    e.spin(start=SEG[MALUS_4])
+    e.confirm()
+    assert e.current_player() == 0
+    assert e.spin(start=1).player == 0
+
+
+def test_assigned_player_is_skipped():
+    e = engine()
+    e.state.assigned[0] = 0
+    out = e.spin()
+    assert out.kind == SKIP and e.state.pending == -1 and e.current_player() == 1
+
+
+def test_nudge_walks_past_burned_segments():
+    e = engine("nudge")
+    e.spin(start=1)
+    e.confirm()
+    e.spin(start=2)
+    e.confirm()
+    out = e.spin(start=1)
+    assert (out.kind, out.steps, out.final) == (MALUS, (2, 3), 3)
+
+
+def test_direct_never_lands_on_burned_segments():
+    for seed in range(50):
+        e = engine("direct", seed)
+        while not e.finished():
+            burned = e.state.burned
+            out = e.spin()
+            assert out.steps == ()
+            if out.kind != SKIP:
+                assert not (burned >> out.start) & 1
+            if e.state.pending >= 0:
+                _confirm(e, out)
+
+
+@pytest.mark.parametrize("selection, spins, assigned", [
+    ("direct", 15, ["6", "4", "5", "1", "3", "2", "10", "9", "8", "7"]),
+    ("nudge", 19, ["6", "5", "8", "7", "2", "4", "1", "9", "10", "3"]),
+])
+def test_fixed_seed_games(selection, spins, assigned):
+    e = engine(selection, seed=42)
+    assert play(e) == spins
+    assert e.finished() and e.view()["assigned"] == assigned
+
+
+def test_nudge_mode_nudges_sometimes():
+    nudged = 0
+    for seed in range(20):
+        e = engine("nudge", seed)
+        while not e.finished():
+            out = e.spin()
+            nudged += len(out.steps)
+            assert out.kind != NONE
+            if e.state.pending >= 0:
+                _confirm(e, out)
+    assert nudged > 0
+
+
+def test_layout_needs_enough_players():
+    with pytest.raises(ValueError):
+        Layout(("a",), ("1", "2"))
@@ -0,0 +1,64 @@
+import pytest
+
+from ruota.engine import MALUS_2, default_layout
+from ruota.journal import OK, SPIN, Journal, game_id
+
+LAYOUT = default_layout()
+GAME = game_id("ruota", LAYOUT)
+
+
+def _free_pack(e):
+    return next(e.layout.prizes[p] for p, seg in enumerate(e.layout.prize_seg) if not e.is_burned(seg))
+
+
+def play_journaled(journal, engine, spins):
+    """Come apply_intents: ogni transizione applicata finisce nel giornale."""
+    for _ in range(spins):
+        if engine.finished():
+            break
+        out = engine.spin()
+        journal.append(GAME, engine, SPIN, str(out.start))
+        if engine.state.pending >= 0:
+            pack = _free_pack(engine) if LAYOUT.seg_id(out.final) == MALUS_2 else None
+            engine.confirm(pack)
+            journal.append(GAME, engine, OK, pack)
+
+
+@pytest.mark.parametrize("selection", ["direct", "nudge"])
+@pytest.mark.parametrize("snapshot_every", [1, 5, 1000])
+def test_resume_restores_state_selection_and_rng(tmp_path, selection, snapshot_every):
+    path = str(tmp_path / "ruota.db")
+    journal = Journal(path, snapshot_every=snapshot_every)
+    live = journal.resume(GAME, LAYOUT, selection=selection)
+    play_journaled(journal, live, 7)
+    journal.close()
+
+    # Riavvio con RUOTA_SELECTION cambiato: conta il modo registrato all'inizio della partita.
+    other = "nudge" if selection == "direct" else "direct"
+    journal = Journal(path, snapshot_every=snapshot_every)
+    resumed = journal.resume(GAME, LAYOUT, selection=other)
+    assert resumed.selection == selection
+    assert resumed.state.to_dict() == live.state.to_dict()
+    assert (resumed.rng.seed, resumed.rng.state) == (live.rng.seed, live.rng.state)
+
+    # Da qui le due partite proseguono identiche.
+    while not live.finished():
+        a, b = live.spin(), resumed.spin()
+        assert a == b
+        if live.state.pending >= 0:
+            pack = _free_pack(live) if LAYOUT.seg_id(a.final) == MALUS_2 else None
+            live.confirm(pack)
+            resumed.confirm(pack)
+    assert resumed.finished() and resumed.view() == live.view()
+    journal.close()
+
+
+def test_reset_starts_a_new_seeded_game(tmp_path):
+    journal = Journal(str(tmp_path / "ruota.db"))
+    first = journal.resume(GAME, LAYOUT, selection="direct")
+    play_journaled(journal, first, 3)
+    journal.reset(GAME)
+    fresh = journal.resume(GAME, LAYOUT, selection="direct")
+    assert fresh.view()["burned"] == [] and fresh.remaining_prizes() == len(LAYOUT.prizes)
+    assert [t for t, _ in journal.events(GAME)] == ["g"]
+    journal.close()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from ruota import replay
+from ruota.engine import MALUS_2, default_layout
+from ruota.journal import OK, SPIN, Journal, game_id
+
+LAYOUT = default_layout()
+GAME = game_id("ruota", LAYOUT)
+
+
+def _free_pack(e):
+    # L'ultimo pacco libero: diverso da quello che sceglierebbe play(), così il replay deve usare i pacchi registrati.
+    return [e.layout.prizes[p] for p, seg in enumerate(e.layout.prize_seg) if not e.is_burned(seg)][-1]
+
+
+@pytest.fixture(params=["direct", "nudge"])
+def recorded(request, tmp_path):
+    """Partita giocata fino in fondo nel giornale; vista dopo ogni giro."""
+    journal = Journal(str(tmp_path / "ruota.db"), snapshot_every=4)
+    engine = journal.resume(GAME, LAYOUT, selection=request.param)
+    views = [engine.view()]
+    while not engine.finished():
+        out = engine.spin()
+        journal.append(GAME, engine, SPIN, str(out.start))
+        if engine.state.pending >= 0:
+            pack = _free_pack(engine) if LAYOUT.seg_id(out.final) == MALUS_2 else None
+            engine.confirm(pack)
+            journal.append(GAME, engine, OK, pack)
+        views.append(engine.view())
+    rec = replay.record(journal, "ruota", LAYOUT)
+    journal.close()
+    return rec, views
+
+
+def test_replay_every_turn_matches_the_live_view(recorded):
+    rec, views = recorded
+    assert rec["spins"] == len(views) - 1
+    for turn, view in enumerate(views):
+        engine, log = replay.replay(rec, turn)
+        assert len(log) == turn
+        assert engine.view() == view
+
+
+def test_replay_from_starts_only(recorded):
+    rec, views = recorded
+    engine, _ = replay.replay(dict(rec, seed=None))
+    assert engine.view() == views[-1]
+
+
+def test_replay_rejects_a_wrong_seed(recorded):
+    rec, _ = recorded
+    with pytest.raises(ValueError, match="il seme dà start"):
+        replay.replay(dict(rec, seed=rec["seed"] ^ 1))
+
+
+def test_play_cli_turn(recorded, tmp_path, capsys):
+    rec, views = recorded
+    path = tmp_path / "partita.json"
+    path.write_text(json.dumps(rec))
+    turn = len(views) // 2
+    assert replay.main(["play", str(path), "--turn", str(turn)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    engine, _ = replay.replay(rec, turn)
+    assert out["turn"] == turn and out == dict(out, **replay.summary(engine))
+    assert out["remaining"] == views[turn]["remaining"]